@@ -758,7 +758,8 @@ def _perform_settings_save(form_data: dict, uploads: dict, operation_id: str | N
             'RECOMMEND_PARTITION_WITH_COVER', 'CONTENT_MODERATION_ENABLED',
             'OPENAI_THINKING_ENABLED', 'SUBTITLE_OPENAI_THINKING_ENABLED', 'SUBTITLE_QC_THINKING_ENABLED',
             'LOG_CLEANUP_ENABLED', 'SUBTITLE_TRANSLATION_ENABLED', 'SUBTITLE_EMBED_IN_VIDEO',
-            'SUBTITLE_KEEP_ORIGINAL', 'YOUTUBE_AUTO_GENERATED_SUBTITLES_ENABLED',
+            'SUBTITLE_KEEP_ORIGINAL', 'SUBTITLE_TRANSLATION_CACHE_ENABLED',
+            'YOUTUBE_AUTO_GENERATED_SUBTITLES_ENABLED',
             'YOUTUBE_PROXY_ENABLED', 'YOUTUBE_API_PROXY_ENABLED', 'password_protection_enabled',
             'SPEECH_RECOGNITION_ENABLED',
             'VAD_ENABLED',
@@ -794,7 +795,8 @@ def _perform_settings_save(form_data: dict, uploads: dict, operation_id: str | N
         numeric_fields = [
             'MAX_CONCURRENT_TASKS', 'MAX_CONCURRENT_UPLOADS', 'LOG_CLEANUP_HOURS',
             'LOG_CLEANUP_INTERVAL', 'SUBTITLE_BATCH_SIZE', 'SUBTITLE_MAX_RETRIES',
-            'SUBTITLE_RETRY_DELAY', 'SUBTITLE_MAX_WORKERS', 'YOUTUBE_DOWNLOAD_THREADS',
+            'SUBTITLE_RETRY_DELAY', 'SUBTITLE_MAX_WORKERS', 'SUBTITLE_MAX_BATCH_TOKENS',
+            'YOUTUBE_DOWNLOAD_THREADS',
             'YOUTUBE_DOWNLOAD_MAX_HEIGHT',
             'LOGIN_MAX_FAILED_ATTEMPTS', 'LOGIN_LOCKOUT_MINUTES', 'LOGIN_SESSION_TIMEOUT_MINUTES',
             'VAD_SILERO_MIN_SPEECH_MS',
@@ -826,6 +828,7 @@ def _perform_settings_save(form_data: dict, uploads: dict, operation_id: str | N
                         'SUBTITLE_MAX_RETRIES': 3,
                         'SUBTITLE_RETRY_DELAY': 5,
                         'SUBTITLE_MAX_WORKERS': 2,
+                        'SUBTITLE_MAX_BATCH_TOKENS': 3000,
                         'YOUTUBE_DOWNLOAD_THREADS': 4,
                         'YOUTUBE_DOWNLOAD_MAX_HEIGHT': 1080,
                         'LOGIN_MAX_FAILED_ATTEMPTS': 5,
@@ -10,11 +10,10 @@ import re
 import ssl
 from hashlib import sha1
 from math import ceil
-from logging.handlers import RotatingFileHandler
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Optional, List, Union, Tuple
-from .utils import get_app_subdir
+from .utils import attach_queued_file_handler, get_app_subdir
 
 from modules.utils import process_cover
 
@@ -41,12 +40,9 @@ def setup_task_logger(task_id):
     if not logger.handlers:  # 避免重复添加处理器
         logger.setLevel(logging.INFO)
         
-        # 文件处理器
-        file_handler = RotatingFileHandler(log_file, maxBytes=10485760, backupCount=5, encoding='utf-8')
+        # 文件处理器 - 与其他模块共用 task_{id}.log 的轮转处理器，由共享监听线程写入
         file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
+        attach_queued_file_handler(logger, log_file, file_formatter, max_bytes=10485760, backup_count=5)
         
         # 确保消息不会传播到根日志记录器
         logger.propagate = False
@@ -10,13 +10,14 @@ import base64
 import traceback
 from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence
 from difflib import SequenceMatcher
-from logging.handlers import RotatingFileHandler
 from .utils import (
+    attach_queued_file_handler,
     get_app_subdir,
     safe_str,
     openai_chat_create_with_thinking_control,
     extract_chat_message_json,
     get_chat_message_text,
+    json_dumps_fast,
 )
 
 import openai
@@ -147,11 +148,9 @@ def setup_task_logger(task_id):
 
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        file_handler = RotatingFileHandler(log_file, maxBytes=10485760, backupCount=5, encoding='utf-8')
+        # 与其他模块共用 task_{id}.log 的轮转处理器，由共享监听线程写入
         file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
+        attach_queued_file_handler(logger, log_file, file_formatter, max_bytes=10485760, backup_count=5)
         logger.propagate = False
 
     return logger
@@ -558,7 +557,7 @@ def _request_chat_completion(
     """公共 LLM 调用逻辑：构建消息、计时、执行请求，返回原始 response。"""
     user_message_content = user_content
     if user_message_content is None:
-        user_message_content = json.dumps(payload, ensure_ascii=False)
+        user_message_content = json_dumps_fast(payload)
     create_kwargs = {
         "model": model_name,
         "messages": [
@@ -1781,7 +1780,7 @@ def _request_content_profile(
                         "type": "text",
                         "text": (
                             "请结合以下 JSON 信息与封面图片，完成内容分析并只返回 JSON。\n"
-                            f"{json.dumps(payload, ensure_ascii=False)}"
+                            f"{json_dumps_fast(payload)}"
                         ),
                     },
                     {
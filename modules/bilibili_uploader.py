@@ -7,14 +7,13 @@ import logging
 import os
 import re
 import traceback
-from logging.handlers import RotatingFileHandler
 from typing import Any, Callable, List, Optional, Tuple, Union
 
 from bilibili_api import video_uploader
 from bilibili_api.exceptions import ArgsException, ResponseCodeException
 
 from .bilibili_auth import load_credential_from_file
-from .utils import get_app_subdir
+from .utils import attach_queued_file_handler, get_app_subdir
 
 BILIBILI_TITLE_LIMIT = 80
 BILIBILI_DESCRIPTION_LIMIT = 2000
@@ -29,15 +28,12 @@ def setup_task_logger(task_id):
 
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        file_handler = RotatingFileHandler(
-            log_file, maxBytes=10485760, backupCount=5, encoding="utf-8"
-        )
         file_formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
+        attach_queued_file_handler(
+            logger, log_file, file_formatter, max_bytes=10485760, backup_count=5
+        )
         logger.propagate = False
 
     return logger
@@ -120,7 +120,9 @@ DEFAULT_CONFIG = {
     "SUBTITLE_TARGET_LANGUAGE": "zh",  # 目标语言 (zh, en, ja, ko等)
     "SUBTITLE_FONT_NAME": "SourceHanSansHWSC-VF.otf",  # 烧录字幕使用的内置字体文件名
     "SUBTITLE_API_PROVIDER": "openai",  # API提供商 (仅支持openai)
-    "SUBTITLE_BATCH_SIZE": 3,  # 批次大小
+    "SUBTITLE_BATCH_SIZE": 3,  # 批次大小（单批条数上限，Token上限只会让长句批次更小）
+    "SUBTITLE_MAX_BATCH_TOKENS": 3000,  # 单批原文估算Token上限（0表示仅按条数分批）
+    "SUBTITLE_TRANSLATION_CACHE_ENABLED": False,  # 复用历史任务中已验收的相同字幕译文（默认关闭）
     "SUBTITLE_MAX_RETRIES": 3,  # 最大重试次数
     "SUBTITLE_RETRY_DELAY": 2,  # 重试延迟(秒)
     "SUBTITLE_EMBED_IN_VIDEO": True,  # 是否将字幕嵌入视频
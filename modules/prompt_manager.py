@@ -19,6 +19,7 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger("prompt_manager")
@@ -390,13 +391,18 @@ def get_final_system_prompt(
 # 字幕翻译专用 API（封装协议壳）
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=64)
 def get_subtitle_system_prompt(
     *,
     mode: str = MODE_BUILTIN,
     user_text: str = "",
     target_language: str = "zh",
 ) -> str:
-    """获取字幕翻译最终 system prompt（含协议壳和 JSON 后缀）。"""
+    """获取字幕翻译最终 system prompt（含协议壳和 JSON 后缀）。
+
+    结果只取决于参数，按 (mode, user_text, target_language) 缓存，
+    同一目标语言的各批次与各任务共用同一字符串。
+    """
     behavior = get_final_system_prompt(
         "SUBTITLE_TRANSLATE",
         mode=mode,
@@ -406,13 +412,14 @@ def get_subtitle_system_prompt(
     return f"{behavior}{_SUBTITLE_SHARED_RULES}{_SUBTITLE_JSON_SUFFIX}"
 
 
+@lru_cache(maxsize=64)
 def get_subtitle_strict_system_prompt(
     *,
     mode: str = MODE_BUILTIN,
     user_text: str = "",
     target_language: str = "zh",
 ) -> str:
-    """获取字幕翻译严格补救最终 system prompt（含协议壳和 JSON 后缀）。"""
+    """获取字幕翻译严格补救最终 system prompt（含协议壳和 JSON 后缀），同样按参数缓存。"""
     behavior = get_final_system_prompt(
         "SUBTITLE_TRANSLATE_STRICT",
         mode=mode,
@@ -31,22 +31,20 @@ except Exception:  # pragma: no cover - 防御性兜底
 
 
 def _setup_task_logger(task_id: str) -> logging.Logger:
-    from .utils import get_app_subdir
-    from logging.handlers import RotatingFileHandler
+    from .utils import attach_queued_file_handler, get_app_subdir
 
     log_dir = get_app_subdir('logs')
     os.makedirs(log_dir, exist_ok=True)
     logger = logging.getLogger(f'speech_recognition_{task_id}')
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        handler = RotatingFileHandler(
+        attach_queued_file_handler(
+            logger,
             os.path.join(log_dir, f'task_{task_id}.log'),
-            maxBytes=10_485_760,
-            backupCount=5,
-            encoding='utf-8',
+            logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+            max_bytes=10_485_760,
+            backup_count=5,
         )
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-        logger.addHandler(handler)
         logger.propagate = False
     return logger
 
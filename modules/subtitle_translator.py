@@ -3,28 +3,74 @@
 
 import os
 import re
-import json
+import atexit
+import importlib.util
+import hashlib
+import sqlite3
 import time
+import random
 import logging
 import gc  # 添加垃圾回收模块以优化内存使用
-from pathlib import Path
+import traceback
 from typing import Dict, List, Optional, Callable
-from dataclasses import dataclass
-from logging.handlers import RotatingFileHandler
+from dataclasses import dataclass, field
+from functools import lru_cache
 import concurrent.futures
-from threading import Lock
+from threading import Event, Lock
+import httpx
+import openai
 from modules.task_manager import TaskCancelledError
 from .utils import (
+    attach_queued_file_handler,
     get_app_subdir,
     openai_chat_create_with_thinking_control,
     extract_chat_message_json,
+    extract_json_from_text,
     get_chat_message_text,
+    collect_chat_stream_message,
+    json_dumps_fast,
 )
 
+try:  # psutil 为可选依赖，缺失时跳过内存感知降并发
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover - 取决于运行环境
+    psutil = None
+
 logger = logging.getLogger('subtitle_translator')
 
 # Pre-compiled regex for Chinese character detection (performance optimization)
 _CHINESE_CHAR_RE = re.compile(r'[\u4e00-\u9fff]')
+_LATIN_ALNUM_RE = re.compile(r'[A-Za-z0-9]')
+_LATIN_LETTER_RE = re.compile(r'[A-Za-z]')
+# 字符分类表：汉字 -> _CJK_MARK，英数 -> _ALNUM_MARK，原文中的标记字符本身删除；
+# translate + count 在 C 层完成计数，用于中文/英数比例判定
+_CJK_MARK = '\x00'
+_ALNUM_MARK = '\x01'
+_CHAR_CLASS_TABLE = {code: _CJK_MARK for code in range(0x4E00, 0xA000)}
+_CHAR_CLASS_TABLE.update({ord(ch): _ALNUM_MARK for ch in '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'})
+_CHAR_CLASS_TABLE.update({ord(_CJK_MARK): None, ord(_ALNUM_MARK): None})
+# 日文假名与韩文，用于排除含汉字的日/韩文原文
+_KANA_HANGUL_RE = re.compile(r'[\u3040-\u30ff\uac00-\ud7af]')
+# 字幕时间戳：SRT 为 HH:MM:SS,mmm，VTT 为 [HH:]MM:SS.mmm；小时位兼容 1-2 位（如 0:00:01,920）
+_TIMESTAMP_RE = re.compile(r'(?:(\d{1,2}):)?(\d{2}):(\d{2})[,.](\d{3})')
+_VTT_SKIPPED_BLOCKS = frozenset(('NOTE', 'STYLE', 'REGION'))
+# 字幕文件读取缓冲大小（1 MiB）
+_READ_BUFFER_SIZE = 1 << 20
+# 译文单行清洗：一次匹配跳过行首编号/项目符号（可连续多个，如 "1. "、"(2)"、"3、"、"- "），
+# 并去掉整行包裹的成对引号；正文落在首个非空捕获组中（单个直引号视为空行）
+_SANITIZE_LINE_RE = re.compile(
+    r'(?:[\(（]?\s*\d+\s*[\)）.:、]\s*|[-–—·•]\s+)*'
+    r'(?:"(.*)"|\'(.*)\'|“(.*)”|‘(.*)’|["\']|(.*))'
+)
+# CJK 字符（含假名、韩文），用于 Token 启发式估算
+_CJK_TOKEN_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]')
+# ASS 换行符（\N \n \h）与覆盖标签（{\an8} 等），用于清洗模型返回的译文
+_ASS_LINE_BREAK_RE = re.compile(r'\\[hHnN]')
+_ASS_OVERRIDE_TAG_RE = re.compile(r'{\\[^}]*}')
+_ASS_TAG_RE = re.compile(r'\\[hHnN]|{\\[^}]*}')
+_WHITESPACE_RUN_RE = re.compile(r'\s+')
+# 行尾空白 + 单个句号/英文句点（省略号 .. 不算）+ 空白，整段文本一次替换
+_TERMINAL_FULL_STOP_RE = re.compile(r'[^\S\n]*(?:。|(?<!\.)\.)?[^\S\n]*$', re.MULTILINE)
 SUBTITLE_RESIDUAL_UNTRANSLATED_RATIO_THRESHOLD = 0.15
 SUBTITLE_RESIDUAL_UNTRANSLATED_COUNT_THRESHOLD = 3
 
@@ -38,9 +84,78 @@ def _should_fail_translation_residue(total_items: int, unresolved_count: int) ->
         and unresolved_ratio > SUBTITLE_RESIDUAL_UNTRANSLATED_RATIO_THRESHOLD
     )
 
+
+class _FatalTranslationError(Exception):
+    """不可重试的接口错误（鉴权失败、无权限、额度耗尽），应立即终止整个翻译任务"""
+
+
+# 不可重试的错误码：401/403 以及 OpenAI 兼容接口的额度耗尽
+_FATAL_API_STATUS_CODES = frozenset((401, 403))
+_FATAL_API_ERROR_CODES = frozenset(('insufficient_quota', 'invalid_api_key', 'account_deactivated'))
+
+
+def _is_fatal_api_error(exc: Exception) -> bool:
+    """判断接口异常是否不可重试；按状态码与错误码识别，无需导入 openai。"""
+    if getattr(exc, 'status_code', None) in _FATAL_API_STATUS_CODES:
+        return True
+    return getattr(exc, 'code', None) in _FATAL_API_ERROR_CODES
+
+# 内存使用率采样缓存：(采样时间, 百分比)，多个翻译任务同时启动时共用一次读数
+_MEMORY_SAMPLE_TTL_SECONDS = 5.0
+_memory_sample: tuple = (0.0, None)
+
+
+def _cached_memory_percent() -> Optional[float]:
+    """返回系统内存使用百分比（5 秒内复用上次读数）；psutil 不可用时返回 None。"""
+    global _memory_sample
+    if psutil is None:
+        return None
+    sampled_at, percent = _memory_sample
+    now = time.monotonic()
+    if percent is None or now - sampled_at >= _MEMORY_SAMPLE_TTL_SECONDS:
+        try:
+            percent = psutil.virtual_memory().percent
+        except Exception:
+            return None
+        _memory_sample = (now, percent)
+    return percent
+
+# 并发数配置为 0（不设上限）时的线程数上限；请求为网络 I/O，等待期间释放 GIL
+_AUTO_MAX_WORKERS = 32
+
+# 指数退避的单次等待上限（秒），Retry-After 指示的等待不受此限制
+_MAX_BACKOFF_SECONDS = 60.0
+
+
+def _compute_retry_delay(base_delay: float, retry: int, exc: Optional[Exception] = None) -> float:
+    """指数退避 + 随机抖动，并尊重接口返回的 Retry-After。"""
+    base = max(0.0, float(base_delay or 0))
+    delay = min(base * (2 ** retry), _MAX_BACKOFF_SECONDS) + random.uniform(0, 0.5 * base)
+    retry_after = getattr(exc, 'retry_after', None)
+    if retry_after is None:
+        headers = getattr(getattr(exc, 'response', None), 'headers', None)
+        if headers is not None:
+            try:
+                retry_after = headers.get('retry-after')
+            except Exception:
+                retry_after = None
+    try:
+        delay = max(delay, float(retry_after or 0))
+    except (TypeError, ValueError):
+        pass
+    return delay
+
+_TASK_LOG_DIR = get_app_subdir('logs')
+_FILE_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_TASK_LOGGERS: Dict[str, logging.Logger] = {}
+_TASK_LOGGERS_LOCK = Lock()
+
+
 def setup_task_logger(task_id):
     """
     为特定任务设置日志记录器 (与ai_enhancer.py保持一致)
+
+    同一任务的记录器只初始化一次，后续调用直接返回缓存实例。
     
     Args:
         task_id: 任务ID
@@ -48,30 +163,286 @@ def setup_task_logger(task_id):
     Returns:
         logger: 配置好的日志记录器
     """
-    log_dir = get_app_subdir('logs')
-    os.makedirs(log_dir, exist_ok=True)
-    
-    log_file = os.path.join(log_dir, f'task_{task_id}.log')
-    logger = logging.getLogger(f'subtitle_translator_{task_id}')
-    
-    if not logger.handlers:  # 避免重复添加处理器
-        logger.setLevel(logging.INFO)
-        
-        # 文件处理器 - 减少文件大小以降低内存使用
-        file_handler = RotatingFileHandler(log_file, maxBytes=5242880, backupCount=3, encoding='utf-8')
-        file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
-        
-        # 确保消息不会传播到根日志记录器
-        logger.propagate = False
-    
-    return logger
+    cache_key = str(task_id)
+    cached = _TASK_LOGGERS.get(cache_key)
+    if cached is not None:
+        return cached
+
+    with _TASK_LOGGERS_LOCK:
+        cached = _TASK_LOGGERS.get(cache_key)
+        if cached is not None:
+            return cached
+
+        log_file = os.path.join(_TASK_LOG_DIR, f'task_{task_id}.log')
+        logger = logging.getLogger(f'subtitle_translator_{task_id}')
+
+        if not logger.handlers:  # 避免重复添加处理器
+            logger.setLevel(logging.INFO)
+
+            # 文件处理器 - 与任务管理器共用 task_{id}.log 的轮转处理器，由共享监听线程写入
+            attach_queued_file_handler(logger, log_file, _FILE_FORMATTER, max_bytes=5242880, backup_count=3)
+
+            # 确保消息不会传播到根日志记录器
+            logger.propagate = False
+
+        _TASK_LOGGERS[cache_key] = logger
+        return logger
+
+# Token 估算：优先使用 tiktoken（可选依赖），不可用时按字符数启发式估算
+_TOKEN_ENCODERS: Dict[str, object] = {}
+_TOKEN_ENCODERS_LOCK = Lock()
+# 快速修复把待补译行尽量合并为少量严格模式请求，单批条数上限（Token 预算仍会提前拆分）
+_QUICK_REPAIR_MAX_ITEMS = 50
+# 单次翻译请求的回复 Token 上限（普通与严格模式共用）
+_MAX_OUTPUT_TOKENS = 4096
+# 打包时按原文估算回复长度：译文相对原文的放大系数 + 每条 JSON 字符串的引号/逗号/转义开销，
+# 并为 {"translations": [...]} 外壳与估算误差预留余量，避免长句批次的回复被截断
+_OUTPUT_EXPANSION = 2.0
+_ITEM_JSON_OVERHEAD_TOKENS = 4
+_OUTPUT_TOKEN_BUDGET = int(_MAX_OUTPUT_TOKENS * 0.8)
+
+
+def _get_token_encoder(model_name: str):
+    """获取并缓存模型对应的 tiktoken 编码器；不可用时返回 None。"""
+    key = model_name or ''
+    if key in _TOKEN_ENCODERS:
+        return _TOKEN_ENCODERS[key]
+    with _TOKEN_ENCODERS_LOCK:
+        if key in _TOKEN_ENCODERS:
+            return _TOKEN_ENCODERS[key]
+        encoder = None
+        try:
+            import tiktoken  # type: ignore
+            try:
+                encoder = tiktoken.encoding_for_model(key)
+            except Exception:
+                encoder = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            encoder = None
+        _TOKEN_ENCODERS[key] = encoder
+        return encoder
+
+
+def _estimate_tokens(text: str, model_name: str = '') -> int:
+    """估算文本 Token 数：CJK 字符约 1 Token/字，其余约 4 字符/Token。"""
+    if not text:
+        return 0
+    encoder = _get_token_encoder(model_name)
+    if encoder is not None:
+        try:
+            return len(encoder.encode(text))
+        except Exception:
+            pass
+    cjk_count = len(_CJK_TOKEN_RE.findall(text))
+    return cjk_count + (len(text) - cjk_count + 3) // 4
+
+
+_CLIENT_CACHE: Dict[tuple, object] = {}
+_CLIENT_CACHE_LOCK = Lock()
+# 所有字幕翻译客户端共用的 HTTP 连接池；安装 h2 时启用 HTTP/2 多路复用
+_HTTP_CLIENT = None
+_HTTP_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+
+def _get_shared_http_client():
+    """获取共享的 httpx 客户端（调用方需持有 _CLIENT_CACHE_LOCK）。"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        http2_enabled = importlib.util.find_spec('h2') is not None
+        # DefaultHttpxClient 保留 openai SDK 的默认超时与重定向设置，旧版 SDK 回退 httpx.Client
+        client_factory = getattr(openai, 'DefaultHttpxClient', None) or httpx.Client
+        _HTTP_CLIENT = client_factory(http2=http2_enabled, limits=_HTTP_POOL_LIMITS)
+        atexit.register(_HTTP_CLIENT.close)
+    return _HTTP_CLIENT
+
+
+class _TranslationCache:
+    """SQLite 译文持久缓存：按 blake2b(模型|目标语言|Prompt 指纹|原文) 保存已验收译文，跨任务与重跑复用。
+
+    缓存只是加速手段：任何数据库异常都只记录调试日志并按未命中处理。
+    超过 max_age_seconds 的条目在首次连接时清理，总行数超过 max_rows 时按写入时间淘汰最旧条目。
+    """
+
+    _QUERY_CHUNK = 500
+    _MAX_ROWS = 200_000
+    _MAX_AGE_SECONDS = 90 * 24 * 3600
+
+    def __init__(self, db_path: str, max_rows: int = _MAX_ROWS, max_age_seconds: float = _MAX_AGE_SECONDS):
+        self._db_path = db_path
+        self._max_rows = max_rows
+        self._max_age_seconds = max_age_seconds
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def make_key(model_name: str, target_language: str, prompt_fingerprint: str, text: str) -> bytes:
+        payload = f"{model_name}\x1f{target_language}\x1f{prompt_fingerprint}\x1f{text}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=10, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS translation_cache ('
+                'key BLOB PRIMARY KEY, translation TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_translation_cache_created_at ON translation_cache(created_at)'
+            )
+            conn.execute(
+                'DELETE FROM translation_cache WHERE created_at < ?', (time.time() - self._max_age_seconds,)
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, str]:
+        """批量查询，返回命中的 key -> 译文。"""
+        found: Dict[bytes, str] = {}
+        if not keys:
+            return found
+        try:
+            with self._lock:
+                conn = self._connect()
+                for i in range(0, len(keys), self._QUERY_CHUNK):
+                    chunk = keys[i:i + self._QUERY_CHUNK]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = conn.execute(
+                        f'SELECT key, translation FROM translation_cache WHERE key IN ({placeholders})',
+                        chunk,
+                    )
+                    found.update(rows)
+        except Exception as e:
+            logger.debug(f"读取译文缓存失败，按未命中处理: {e}")
+        return found
+
+    def put_many(self, pairs: List[tuple]) -> None:
+        """批量写入 (key, 译文)，单事务提交；超出行数上限时淘汰最旧条目。"""
+        if not pairs:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO translation_cache (key, translation, created_at) VALUES (?, ?, ?)',
+                        [(key, translation, now) for key, translation in pairs],
+                    )
+                    excess = conn.execute('SELECT COUNT(*) FROM translation_cache').fetchone()[0] - self._max_rows
+                    if excess > 0:
+                        conn.execute(
+                            'DELETE FROM translation_cache WHERE key IN '
+                            '(SELECT key FROM translation_cache ORDER BY created_at LIMIT ?)',
+                            (excess,),
+                        )
+        except Exception as e:
+            logger.debug(f"写入译文缓存失败，已跳过: {e}")
+
+
+_PERSISTENT_CACHE: Optional[_TranslationCache] = None
+_PERSISTENT_CACHE_LOCK = Lock()
+
+
+def _get_persistent_cache() -> _TranslationCache:
+    """获取进程内共享的译文持久缓存（db/subtitle_translation_cache.db）。"""
+    global _PERSISTENT_CACHE
+    if _PERSISTENT_CACHE is None:
+        with _PERSISTENT_CACHE_LOCK:
+            if _PERSISTENT_CACHE is None:
+                _PERSISTENT_CACHE = _TranslationCache(
+                    os.path.join(get_app_subdir('db'), 'subtitle_translation_cache.db')
+                )
+    return _PERSISTENT_CACHE
+
+
+# 语言代码到中文书写系统的映射；只写 "zh" 时无法确定简繁，不视为已知
+_CHINESE_SCRIPTS = {
+    'zh-cn': 'hans', 'zh-sg': 'hans', 'zh-my': 'hans', 'zh-hans': 'hans',
+    'zh-tw': 'hant', 'zh-hk': 'hant', 'zh-mo': 'hant', 'zh-hant': 'hant',
+}
+
+
+def _same_chinese_script(source_language: str, target_language: str) -> bool:
+    """源语言与目标语言均为中文且书写系统（简/繁）明确相同时返回 True。
+
+    只有此时纯汉字原文才能免翻译直接保留；自动检测的源语言可能是繁体中文或只含汉字的日文。
+    """
+    source_script = _CHINESE_SCRIPTS.get(str(source_language or '').strip().lower().replace('_', '-'))
+    return source_script is not None and source_script == _CHINESE_SCRIPTS.get(
+        str(target_language or '').strip().lower().replace('_', '-')
+    )
+
+
+def _is_already_chinese_text(text: str, target_language: str) -> bool:
+    """目标语言为中文且原文已是纯中文（含汉字、无拉丁字母/假名/韩文）时返回 True。"""
+    if not text or not str(target_language or '').lower().startswith('zh'):
+        return False
+    return (
+        _CHINESE_CHAR_RE.search(text) is not None
+        and _LATIN_LETTER_RE.search(text) is None
+        and _KANA_HANGUL_RE.search(text) is None
+    )
+
+
+@lru_cache(maxsize=8192)
+def _is_likely_untranslated(src: str, dst: str, target_language: str) -> bool:
+    """_likely_untranslated 的纯函数实现；同一 (原文, 译文) 在主流程、补翻与验收中反复判定，按参数缓存。"""
+    s = src.strip()
+    d = dst.strip()
+    if not d:
+        return True
+    if d == s:
+        # 原文本就是中文时原样保留属正常；否则结果与原文一致多半未翻译
+        return not _is_already_chinese_text(s, target_language)
+    # 计算非中文比例（仅中文汉字 vs 英数；标点/符号/表情不计入分母）
+    classified = d.translate(_CHAR_CLASS_TABLE)
+    chinese = classified.count(_CJK_MARK)
+    non_chinese = classified.count(_ALNUM_MARK)
+    denom = chinese + non_chinese
+    if denom == 0:
+        return False
+    return non_chinese / denom > 0.8
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_cached(text: str) -> str:
+    """_sanitize_translated_text 的纯函数实现；模型常对多条字幕回显相同套话，按原文缓存清洗结果。"""
+    try:
+        # 以 casefold 后的文本为键去重，dict 保持首次出现的顺序
+        cleaned: Dict[str, str] = {}
+
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            # 单次匹配移除前置编号/项目符号与整行包裹引号
+            match = _SANITIZE_LINE_RE.fullmatch(line)
+            line = next((group for group in match.groups() if group is not None), '').strip()
+
+            if line:
+                cleaned.setdefault(line.casefold(), line)
+
+        sanitized = '\n'.join(cleaned.values()).strip()
+        return SubtitleWriter._strip_terminal_full_stop(sanitized)
+    except Exception:
+        return SubtitleWriter._strip_terminal_full_stop(text.strip())
+
+
+def _cache_text_key(text: str) -> str:
+    """缓存用的原文标准化：仅忽略首尾空白；大小写可能改变含义（如 "US" 与 "us"），保持原样。"""
+    return str(text or '').strip()
+
 
 def get_openai_client(openai_config):
     """
     创建OpenAI客户端 (与ai_enhancer.py保持一致)
+
+    相同 (api_key, base_url, timeout) 的客户端在进程内共享，且所有客户端
+    共用同一 HTTP 连接池，以复用 TCP/TLS 连接。
     
     Args:
         openai_config (dict): OpenAI配置信息，包含api_key, base_url等
@@ -79,8 +450,6 @@ def get_openai_client(openai_config):
     Returns:
         OpenAI客户端实例
     """
-    import openai
-    
     # 配置选项
     api_key = openai_config.get('OPENAI_API_KEY', '')
     options = {}
@@ -95,11 +464,16 @@ def get_openai_client(openai_config):
         timeout_seconds = 600.0
     if timeout_seconds > 0:
         options['timeout'] = timeout_seconds
-    
-    # 创建并返回新版客户端实例
-    return openai.OpenAI(api_key=api_key, **options)
 
-@dataclass
+    cache_key = (api_key, options.get('base_url', ''), options.get('timeout'))
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(cache_key)
+        if client is None:
+            client = openai.OpenAI(api_key=api_key, http_client=_get_shared_http_client(), **options)
+            _CLIENT_CACHE[cache_key] = client
+    return client
+
+@dataclass(slots=True)
 class SubtitleItem:
     """字幕条目"""
     index: int
@@ -107,12 +481,13 @@ class SubtitleItem:
     end_time: str
     source_text: str
     translated_text: str = ""
-    
-    @property
-    def time_range(self):
-        return f"{self.start_time} --> {self.end_time}"
+    # 时间范围字符串在构造时生成一次，写出时直接复用
+    time_range: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.time_range = f"{self.start_time} --> {self.end_time}"
 
-@dataclass
+@dataclass(slots=True)
 class TranslationConfig:
     """翻译配置"""
     source_language: str = "auto"
@@ -121,9 +496,11 @@ class TranslationConfig:
     api_key: str = ""
     base_url: str = "https://api.openai.com/v1"
     model_name: str = "gpt-3.5-turbo"
-    batch_size: int = 3  # 减少批次大小以降低内存使用
+    batch_size: int = 3  # 每批条数上限；启用 Token 预算时长句批次可能更小
+    max_batch_tokens: int = 3000  # 单批原文估算Token上限，0表示仅按条数分批
+    persistent_cache_enabled: bool = False  # 是否启用跨任务的译文持久缓存
     max_retries: int = 3
-    retry_delay: int = 2
+    retry_delay: float = 2.0  # 退避基准秒数，仅用于 sleep，允许小数
     max_workers: int = 2  # 减少最大并发线程数以降低内存使用
     thinking_enabled: bool = False
     timeout_seconds: int = 600  # API请求超时秒数；思考模型输出可达64k token，建议不低于300
@@ -133,6 +510,17 @@ class TranslationConfig:
     prompt_strict_mode: str = "builtin"  # 字幕翻译严格补救 Prompt 模式
     prompt_strict_text: str = ""  # 字幕翻译严格补救 Prompt 用户文本
 
+    def __post_init__(self):
+        # 统一转换来自配置文件/表单的数值字段（兼容 "1.5" 这类字符串），空值或非法值回退默认值
+        for name in ('batch_size', 'max_batch_tokens', 'max_retries', 'retry_delay', 'max_workers', 'timeout_seconds'):
+            try:
+                value = float(getattr(self, name))
+                if name != 'retry_delay':
+                    value = int(value)
+            except (TypeError, ValueError, OverflowError):
+                value = self.__dataclass_fields__[name].default
+            setattr(self, name, value)
+
 class SubtitleReader:
     """字幕文件读取器"""
 
@@ -172,129 +560,205 @@ class SubtitleReader:
         if not text:
             return text
         
+        # 单行字幕（最常见）无需合并
+        if '\n' not in text:
+            return text.strip()
+        
         # 移除首尾空白
         text = text.strip()
         
         # 将多行文本合并为单行
         # 使用空格连接不同行，但保留必要的标点符号间距
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines = [stripped for stripped in (line.strip() for line in text.split('\n')) if stripped]
         
         if len(lines) <= 1:
             return text
         
-        # 合并多行，智能处理标点符号和 CJK 字符
-        merged_text = ""
-        for i, line in enumerate(lines):
-            if i == 0:
-                merged_text = line
-            else:
-                prev_char = merged_text[-1] if merged_text else ""
-                curr_char = line[0] if line else ""
-                
-                # CJK 字符之间不需要空格
-                if (SubtitleReader._is_cjk_char(prev_char)
-                        and SubtitleReader._is_cjk_char(curr_char)):
-                    merged_text += line
-                # 标点符号附近直接连接
-                elif (prev_char in SubtitleReader._TRAILING_PUNCT
-                        or curr_char in SubtitleReader._LEADING_PUNCT):
-                    merged_text += line
-                else:
-                    merged_text += " " + line
+        # 合并多行，智能处理标点符号和 CJK 字符；分段收集后一次拼接
+        parts = [lines[0]]
+        prev_char = lines[0][-1]
+        for line in lines[1:]:
+            curr_char = line[0]
+            # CJK 字符之间不需要空格；标点符号附近直接连接
+            if not ((SubtitleReader._is_cjk_char(prev_char)
+                     and SubtitleReader._is_cjk_char(curr_char))
+                    or prev_char in SubtitleReader._TRAILING_PUNCT
+                    or curr_char in SubtitleReader._LEADING_PUNCT):
+                parts.append(" ")
+            parts.append(line)
+            prev_char = line[-1]
+        merged_text = ''.join(parts)
         
-        logger.info(f"字幕前处理：多行合并为单行")
-        logger.debug(f"原文本: {repr(text)}")
-        logger.debug(f"处理后: {repr(merged_text)}")
+        logger.debug(f"字幕前处理：多行合并为单行 {repr(text)} -> {repr(merged_text)}")
         
         return merged_text
     
     @staticmethod
-    def read_srt(file_path: str) -> List[SubtitleItem]:
-        """读取SRT字幕文件（兼容更宽松的SRT变体与ASR输出）"""
+    def _open_text(file_path: str):
+        """以大缓冲区流式打开字幕文件：兼容 BOM，非法 UTF-8 字节替换而非整体失败。"""
+        return open(
+            file_path,
+            'r',
+            encoding='utf-8-sig',
+            errors='replace',
+            newline='',
+            buffering=_READ_BUFFER_SIZE,
+        )
+
+    @staticmethod
+    def _parse_timestamp(value: str) -> Optional[str]:
+        """解析单个时间戳并统一为 SRT 格式 HH:MM:SS,mmm；无法识别时返回 None。"""
+        match = _TIMESTAMP_RE.fullmatch(value)
+        if not match:
+            return None
+        hours, minutes, seconds, millis = match.groups()
+        return f"{int(hours or 0):02d}:{minutes}:{seconds},{millis}"
+
+    @staticmethod
+    def _parse_timing_line(line: str):
+        """解析时间行 "start --> end [cue settings]"，返回 (start, end) 或 None。"""
+        if '-->' not in line:
+            return None
+        start_part, _, end_part = line.partition('-->')
+        end_tokens = end_part.split(None, 1)
+        if not end_tokens:
+            return None
+        start_time = SubtitleReader._parse_timestamp(start_part.strip())
+        end_time = SubtitleReader._parse_timestamp(end_tokens[0])
+        if start_time is None or end_time is None:
+            return None
+        return start_time, end_time
+
+    @staticmethod
+    def _build_item(index: int, start_time: str, end_time: str, text_lines: List[str]) -> Optional[SubtitleItem]:
+        processed_text = SubtitleReader._preprocess_subtitle_text('\n'.join(text_lines))
+        if not processed_text:
+            return None
+        return SubtitleItem(
+            index=index,
+            start_time=start_time,
+            end_time=end_time,
+            source_text=processed_text
+        )
+
+    @staticmethod
+    def read_srt(file_path: str, max_items: Optional[int] = None) -> List[SubtitleItem]:
+        """读取SRT字幕文件（兼容更宽松的SRT变体与ASR输出）
+
+        逐行流式解析：以时间行作为字幕块边界，时间行前紧邻的纯数字行视为编号；
+        部分ASR会输出无编号的SRT块（仅时间行 + 文本），此时按出现顺序编号。
+        指定 max_items 时，收集到足够条目后立即停止读取。
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                raw = f.read()
+            items: List[SubtitleItem] = []
+            cue_count = 0
+            cue = None  # [index, start_time, end_time, text_lines]
+            pending_index = None  # 纯数字行，需紧跟时间行才算作编号
 
-            content = raw.strip()
-            if not content:
-                return []
+            with SubtitleReader._open_text(file_path) as f:
+                for raw_line in f:
+                    line = raw_line.strip()
+                    if not line:
+                        continue
+
+                    timing = SubtitleReader._parse_timing_line(line)
+                    if timing is not None:
+                        if cue is not None:
+                            item = SubtitleReader._build_item(*cue)
+                            if item:
+                                items.append(item)
+                                if max_items is not None and len(items) >= max_items:
+                                    cue = None
+                                    break
+                        cue_count += 1
+                        index = int(pending_index) if pending_index is not None else cue_count
+                        cue = [index, timing[0], timing[1], []]
+                        pending_index = None
+                        continue
 
-            # 标准化换行
-            content = content.replace('\r\n', '\n').replace('\r', '\n')
-
-            # 先尝试严格格式：带编号的块
-            # 小时位放宽为1-2位，兼容 0:00:01,920 与 00:00:01,920
-            pattern_strict = r'(\d+)\n(\d{1,2}:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(\d{1,2}:\d{2}:\d{2}[,.]\d{3})\n(.*?)(?=\n\d+\n|\Z)'
-            matches = re.findall(pattern_strict, content, re.DOTALL)
-
-            blocks: List[SubtitleItem] = []
-            if matches:
-                for index, start_time, end_time, text in matches:
-                    processed_text = SubtitleReader._preprocess_subtitle_text(text)
-                    if processed_text:
-                        # 统一时间为SRT逗号毫秒
-                        st = start_time.replace('.', ',')
-                        et = end_time.replace('.', ',')
-                        blocks.append(SubtitleItem(
-                            index=int(index),
-                            start_time=st,
-                            end_time=et,
-                            source_text=processed_text
-                        ))
-            else:
-                # 回退解析：部分ASR会输出无编号的SRT块，仅时间行 + 文本
-                pattern_loose = r'(\d{1,2}:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(\d{1,2}:\d{2}:\d{2}[,.]\d{3})\n(.*?)(?=\n\d{1,2}:\d{2}:\d{2}|\Z)'
-                loose_matches = re.findall(pattern_loose, content, re.DOTALL)
-                for i, (start_time, end_time, text) in enumerate(loose_matches, 1):
-                    processed_text = SubtitleReader._preprocess_subtitle_text(text)
-                    if processed_text:
-                        st = start_time.replace('.', ',')
-                        et = end_time.replace('.', ',')
-                        blocks.append(SubtitleItem(
-                            index=i,
-                            start_time=st,
-                            end_time=et,
-                            source_text=processed_text
-                        ))
-
-            logger.info(f"SRT文件读取完成，共{len(blocks)}条字幕（已进行前处理）")
-            return blocks
+                    # 上一个纯数字行之后不是时间行，说明它是正文
+                    if pending_index is not None:
+                        if cue is not None:
+                            cue[3].append(pending_index)
+                        pending_index = None
+
+                    if line.isdecimal():
+                        pending_index = line
+                    elif cue is not None:
+                        cue[3].append(line)
+
+            if cue is not None:
+                if pending_index is not None:
+                    cue[3].append(pending_index)
+                item = SubtitleReader._build_item(*cue)
+                if item:
+                    items.append(item)
+
+            logger.info(f"SRT文件读取完成，共{len(items)}条字幕（已进行前处理）")
+            return items
         except Exception as e:
             logger.error(f"读取SRT文件失败: {e}")
             return []
     
     @staticmethod
-    def read_vtt(file_path: str) -> List[SubtitleItem]:
-        """读取VTT字幕文件"""
+    def read_vtt(file_path: str, max_items: Optional[int] = None) -> List[SubtitleItem]:
+        """读取VTT字幕文件
+
+        逐行流式解析：跳过 WEBVTT 头部与 NOTE/STYLE/REGION 块，
+        忽略可选的 cue 标识行与时间行后的 cue settings，字幕块以空行结束。
+        指定 max_items 时，收集到足够条目后立即停止读取。
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-            
-            # 移除WEBVTT头部
-            lines = content.split('\n')
-            if lines[0].startswith('WEBVTT'):
-                lines = lines[1:]
-            
-            # VTT格式解析
-            content = '\n'.join(lines)
-            pattern = r'(\d{2}:\d{2}:\d{2}\.\d{3}) --> (\d{2}:\d{2}:\d{2}\.\d{3})\n(.*?)(?=\n\d{2}:\d{2}|\Z)'
-            matches = re.findall(pattern, content, re.DOTALL)
-            
-            items = []
-            for i, match in enumerate(matches, 1):
-                start_time, end_time, text = match
-                
-                # 前处理字幕文本：将多行改为单行
-                processed_text = SubtitleReader._preprocess_subtitle_text(text)
-                
-                if processed_text:
-                    items.append(SubtitleItem(
-                        index=i,
-                        start_time=start_time.replace('.', ','),  # 转换为SRT格式
-                        end_time=end_time.replace('.', ','),
-                        source_text=processed_text
-                    ))
-            
+            items: List[SubtitleItem] = []
+            cue_count = 0
+            cue = None  # [index, start_time, end_time, text_lines]
+            skipping_block = False
+
+            with SubtitleReader._open_text(file_path) as f:
+                for line_no, raw_line in enumerate(f):
+                    line = raw_line.strip()
+                    if line_no == 0 and line.startswith('WEBVTT'):
+                        skipping_block = True
+                        continue
+
+                    if not line:
+                        skipping_block = False
+                        if cue is not None:
+                            item = SubtitleReader._build_item(*cue)
+                            cue = None
+                            if item:
+                                items.append(item)
+                                if max_items is not None and len(items) >= max_items:
+                                    break
+                        continue
+
+                    if skipping_block:
+                        continue
+
+                    timing = SubtitleReader._parse_timing_line(line)
+                    if timing is not None:
+                        if cue is not None:
+                            item = SubtitleReader._build_item(*cue)
+                            if item:
+                                items.append(item)
+                                if max_items is not None and len(items) >= max_items:
+                                    cue = None
+                                    break
+                        cue_count += 1
+                        cue = [cue_count, timing[0], timing[1], []]
+                        continue
+
+                    if cue is not None:
+                        cue[3].append(line)
+                    elif line.split(None, 1)[0] in _VTT_SKIPPED_BLOCKS:
+                        skipping_block = True
+                    # 其余为 cue 标识行，直接忽略
+
+            if cue is not None:
+                item = SubtitleReader._build_item(*cue)
+                if item:
+                    items.append(item)
+
             logger.info(f"VTT文件读取完成，共{len(items)}条字幕（已进行前处理）")
             return items
         except Exception as e:
@@ -309,29 +773,26 @@ class SubtitleWriter:
         """移除每行结尾的句号/英文句点，保留其他标点。"""
         if not text:
             return text
+        return _TERMINAL_FULL_STOP_RE.sub('', str(text))
 
-        normalized_lines: List[str] = []
-        for raw_line in str(text).split('\n'):
-            line = raw_line.rstrip()
-            if line.endswith('。'):
-                line = line[:-1].rstrip()
-            elif line.endswith('.') and not line.endswith('..'):
-                line = line[:-1].rstrip()
-            normalized_lines.append(line)
-        return '\n'.join(normalized_lines)
+    @staticmethod
+    def _write_utf8(output_path: str, parts: List[str]) -> None:
+        """拼接后一次编码为 UTF-8 字节并一次写出，统一使用 LF 换行。"""
+        data = ''.join(parts).encode('utf-8')
+        with open(output_path, 'wb') as f:
+            f.write(data)
 
     @staticmethod
     def write_srt(items: List[SubtitleItem], output_path: str, translated: bool = True):
         """写入SRT字幕文件"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                for item in items:
-                    text = item.translated_text if translated and item.translated_text else item.source_text
-                    if translated:
-                        text = SubtitleWriter._strip_terminal_full_stop(text)
-                    f.write(f"{item.index}\n")
-                    f.write(f"{item.time_range}\n")
-                    f.write(f"{text}\n\n")
+            parts: List[str] = []
+            for item in items:
+                text = item.translated_text if translated and item.translated_text else item.source_text
+                if translated:
+                    text = SubtitleWriter._strip_terminal_full_stop(text)
+                parts.append(f"{item.index}\n{item.time_range}\n{text}\n\n")
+            SubtitleWriter._write_utf8(output_path, parts)
             logger.info(f"SRT文件已保存: {output_path}")
         except Exception as e:
             logger.error(f"写入SRT文件失败: {e}")
@@ -340,20 +801,32 @@ class SubtitleWriter:
     def write_vtt(items: List[SubtitleItem], output_path: str, translated: bool = True):
         """写入VTT字幕文件"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write("WEBVTT\n\n")
-                for item in items:
-                    text = item.translated_text if translated and item.translated_text else item.source_text
-                    if translated:
-                        text = SubtitleWriter._strip_terminal_full_stop(text)
-                    start_time = item.start_time.replace(',', '.')
-                    end_time = item.end_time.replace(',', '.')
-                    f.write(f"{start_time} --> {end_time}\n")
-                    f.write(f"{text}\n\n")
+            parts: List[str] = ["WEBVTT\n\n"]
+            for item in items:
+                text = item.translated_text if translated and item.translated_text else item.source_text
+                if translated:
+                    text = SubtitleWriter._strip_terminal_full_stop(text)
+                start_time = item.start_time.replace(',', '.')
+                end_time = item.end_time.replace(',', '.')
+                parts.append(f"{start_time} --> {end_time}\n{text}\n\n")
+            SubtitleWriter._write_utf8(output_path, parts)
             logger.info(f"VTT文件已保存: {output_path}")
         except Exception as e:
             logger.error(f"写入VTT文件失败: {e}")
 
+# 结构化用户提示词中与批次无关的部分只序列化一次，每批只编码原文数组
+_USER_PROMPT_PREFIX = json_dumps_fast(
+    {
+        "task": "subtitle_translation",
+        "requirements": {
+            "one_to_one_alignment": True,
+            "no_cross_item_carryover": True,
+            "keep_fragment_boundaries": True,
+        },
+    }
+)[:-1] + ',"texts":'
+
+
 class LLMRequester:
     """LLM请求处理器 (与ai_enhancer.py保持一致的调用方式)"""
     
@@ -363,8 +836,17 @@ class LLMRequester:
         self.logger = setup_task_logger(self.task_id)
         self.client = None
         self._init_client()
+        # 系统提示词只依赖目标语言与快照后的 Prompt 配置，按目标语言缓存
+        self._system_prompt_cache: Dict[str, str] = {}
+        self._strict_system_prompt_cache: Dict[str, str] = {}
+        # 译文缓存：(目标语言, 标准化原文) -> 译文，用于跳过重复字幕行；只收录通过有效性检查的译文
+        self._translation_cache: Dict[tuple, str] = {}
+        # 跨任务的持久缓存（默认关闭，由 TRANSLATION_CACHE_ENABLED 开启）
+        self._persistent_cache = (
+            _get_persistent_cache() if (openai_config or {}).get('TRANSLATION_CACHE_ENABLED') else None
+        )
         
-        # 线程锁，用于线程安全的日志记录
+        # 仅用于让“错误 + 堆栈”等多条日志成对输出；单条日志由 logging 自身保证线程安全
         self._log_lock = Lock()
         self._batch_counter = 0
         self._batch_log_interval = 10
@@ -383,13 +865,88 @@ class LLMRequester:
         except Exception as e:
             self.logger.error(f"初始化OpenAI客户端失败: {e}")
     
-    def translate_batch(self, texts: List[str], target_language: str, batch_id: str = "") -> List[str]:
-        """批量翻译文本，使用结构化JSON输出"""
+    def translate_batch(self, texts: List[str], target_language: str, batch_id: str = "",
+                        use_cache: bool = True) -> List[str]:
+        """批量翻译文本，使用结构化JSON输出
+
+        use_cache 为 True 时，同一目标语言下已验收过的原文（忽略首尾空白）
+        直接复用缓存译文（先查内存，再查持久缓存），只把未命中的文本发给模型；
+        重试与补翻应传 False 强制重新请求。模型返回的译文不在此处入缓存，
+        由调用方检查后通过 remember_translations 登记。
+        """
         if not texts:
             return []
         if not self.client:
             raise RuntimeError("OpenAI客户端未初始化")
-        
+
+        # 源语言与目标语言为同一中文书写系统时，已是中文的原文直接原样返回，不占用模型请求
+        if _same_chinese_script(self.openai_config.get('SOURCE_LANGUAGE', 'auto'), target_language):
+            results: List[Optional[str]] = [
+                text if _is_already_chinese_text(text, target_language) else None for text in texts
+            ]
+        else:
+            results = [None] * len(texts)
+        pending = [i for i, result in enumerate(results) if result is None]
+        if len(pending) < len(texts):
+            self.logger.debug(f"批次 {batch_id}: {len(texts) - len(pending)}/{len(texts)} 条已是中文，跳过翻译")
+        if not pending:
+            return results
+
+        if not use_cache:
+            translations = self._request_batch([texts[i] for i in pending], target_language, batch_id)
+            for i, translation in zip(pending, translations):
+                results[i] = translation
+            return results
+
+        keys = {i: (target_language, _cache_text_key(texts[i])) for i in pending}
+        for i in pending:
+            results[i] = self._translation_cache.get(keys[i])
+        miss_indices = [i for i in pending if results[i] is None]
+        if miss_indices and self._persistent_cache is not None:
+            disk_keys = {i: self._persistent_key(target_language, keys[i][1]) for i in miss_indices}
+            stored = self._persistent_cache.get_many(list(disk_keys.values()))
+            if stored:
+                for i, disk_key in disk_keys.items():
+                    translation = stored.get(disk_key)
+                    if translation:
+                        results[i] = translation
+                        self._translation_cache[keys[i]] = translation
+                miss_indices = [i for i in miss_indices if results[i] is None]
+        if miss_indices:
+            translations = self._request_batch([texts[i] for i in miss_indices], target_language, batch_id)
+            for i, translation in zip(miss_indices, translations):
+                results[i] = translation
+        hit_count = len(pending) - len(miss_indices)
+        if hit_count:
+            self.logger.debug(f"批次 {batch_id}: 命中翻译缓存 {hit_count}/{len(texts)} 条")
+        return results
+
+    def remember_translations(self, pairs: List[tuple], target_language: str) -> None:
+        """把已通过有效性检查的 (原文, 译文) 登记到内存缓存，供后续批次中的重复行复用。"""
+        for source, translation in pairs:
+            if translation:
+                self._translation_cache[(target_language, _cache_text_key(source))] = translation
+
+    def store_persistent_translations(self, pairs: List[tuple], target_language: str) -> None:
+        """把已验收的 (原文, 译文) 写入持久缓存；未启用时忽略。"""
+        if self._persistent_cache is None or not pairs:
+            return
+        self._persistent_cache.put_many([
+            (self._persistent_key(target_language, _cache_text_key(source)), translation)
+            for source, translation in pairs
+        ])
+
+    def _persistent_key(self, target_language: str, text_key: str) -> bytes:
+        """持久缓存键：模型、目标语言与生效的系统提示词（模式 + 文本哈希）任一变化都不会命中旧译文。"""
+        system_prompt = self._build_structured_system_prompt(target_language)
+        prompt_digest = hashlib.blake2b(system_prompt.encode('utf-8'), digest_size=8).hexdigest()
+        prompt_fingerprint = f"{self.openai_config.get('PROMPT_MODE', 'builtin')}:{prompt_digest}"
+        return _TranslationCache.make_key(
+            self.openai_config.get('OPENAI_MODEL_NAME', ''), target_language, prompt_fingerprint, text_key
+        )
+
+    def _request_batch(self, texts: List[str], target_language: str, batch_id: str = "") -> List[str]:
+        """向模型发送一个翻译批次并解析结构化结果。"""
         try:
             self._batch_counter += 1
             log_as_info = self._should_log_batch(batch_id)
@@ -401,11 +958,10 @@ class LLMRequester:
             
             start_time = time.time()
             
-            with self._log_lock:
-                self.logger.log(
-                    logging.INFO if log_as_info else logging.DEBUG,
-                    f"开始翻译批次 {batch_id}，包含 {len(texts)} 条字幕"
-                )
+            self.logger.log(
+                logging.INFO if log_as_info else logging.DEBUG,
+                f"开始翻译批次 {batch_id}，包含 {len(texts)} 条字幕"
+            )
             
             # 使用与ai_enhancer.py相同的API调用方式，添加JSON输出格式
             response = openai_chat_create_with_thinking_control(
@@ -416,35 +972,33 @@ class LLMRequester:
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_prompt}
                     ],
-                    "max_tokens": 4096,
+                    "max_tokens": _MAX_OUTPUT_TOKENS,
                     "response_format": {"type": "json_object"},  # 强制JSON输出
+                    "stream": True,  # 流式接收，边到达边汇总，避免整包缓冲
                 },
                 thinking_enabled=self.openai_config.get('OPENAI_THINKING_ENABLED', False),
                 logger=self.logger,
                 scene_name='subtitle_translate_batch',
             )
+            message = collect_chat_stream_message(response)
             
             response_time = time.time() - start_time
             
-            with self._log_lock:
-                self.logger.log(
-                    logging.INFO if log_as_info else logging.DEBUG,
-                    f"批次 {batch_id} 翻译完成，耗时: {response_time:.2f}秒"
-                )
+            self.logger.log(
+                logging.INFO if log_as_info else logging.DEBUG,
+                f"批次 {batch_id} 翻译完成，耗时: {response_time:.2f}秒"
+            )
             
             # 检查响应是否有效
-            if not response.choices or len(response.choices) == 0:
-                with self._log_lock:
-                    self.logger.warning(f"批次 {batch_id}: API返回空的choices列表")
+            if message is None:
+                self.logger.warning(f"批次 {batch_id}: API返回空的choices列表")
                 return [""] * len(texts)
             
-            message = response.choices[0].message
             return self._parse_structured_translation_result(message, len(texts), batch_id)
             
         except Exception as e:
             with self._log_lock:
                 self.logger.error(f"批次 {batch_id} 翻译请求失败: {e}")
-                import traceback
                 self.logger.error(traceback.format_exc())
             raise
 
@@ -469,8 +1023,7 @@ class LLMRequester:
             system_prompt = self._build_strict_structured_system_prompt(target_language)
             user_prompt = self._build_structured_user_prompt(texts)
             model_name = self.openai_config.get('OPENAI_MODEL_NAME', 'gpt-3.5-turbo')
-            with self._log_lock:
-                self.logger.info(f"开始严格模式翻译批次 {batch_id}，包含 {len(texts)} 条字幕")
+            self.logger.info(f"开始严格模式翻译批次 {batch_id}，包含 {len(texts)} 条字幕")
             response = openai_chat_create_with_thinking_control(
                 client=self.client,
                 create_kwargs={
@@ -479,7 +1032,7 @@ class LLMRequester:
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_prompt}
                     ],
-                    "max_tokens": 4096,
+                    "max_tokens": _MAX_OUTPUT_TOKENS,
                     "response_format": {"type": "json_object"},
                 },
                 thinking_enabled=self.openai_config.get('OPENAI_THINKING_ENABLED', False),
@@ -489,30 +1042,36 @@ class LLMRequester:
             
             # 检查响应是否有效
             if not response.choices or len(response.choices) == 0:
-                with self._log_lock:
-                    self.logger.warning(f"严格模式批次 {batch_id}: API返回空的choices列表")
+                self.logger.warning(f"严格模式批次 {batch_id}: API返回空的choices列表")
                 return [""] * len(texts)
             
             message = response.choices[0].message
             return self._parse_structured_translation_result(message, len(texts), batch_id)
         except Exception as e:
-            with self._log_lock:
-                self.logger.error(f"严格模式批次 {batch_id} 翻译失败: {e}")
+            self.logger.error(f"严格模式批次 {batch_id} 翻译失败: {e}")
             raise
     
     def _build_structured_system_prompt(self, target_language: str) -> str:
-        """构建结构化系统提示词（委托给统一 Prompt 中心）。"""
+        """构建结构化系统提示词（委托给统一 Prompt 中心，按目标语言缓存）。"""
+        cached = self._system_prompt_cache.get(target_language)
+        if cached is not None:
+            return cached
         from .prompt_manager import get_subtitle_system_prompt
-        return get_subtitle_system_prompt(
+        prompt = get_subtitle_system_prompt(
             mode=self.openai_config.get('PROMPT_MODE', 'builtin'),
             user_text=self.openai_config.get('PROMPT_TEXT', ''),
             target_language=target_language,
         )
+        self._system_prompt_cache[target_language] = prompt
+        return prompt
 
     def _build_strict_structured_system_prompt(self, target_language: str) -> str:
-        """严格模式提示词（委托给统一 Prompt 中心）。"""
+        """严格模式提示词（委托给统一 Prompt 中心，按目标语言缓存）。"""
+        cached = self._strict_system_prompt_cache.get(target_language)
+        if cached is not None:
+            return cached
         from .prompt_manager import get_subtitle_strict_system_prompt
-        return get_subtitle_strict_system_prompt(
+        prompt = get_subtitle_strict_system_prompt(
             mode=self.openai_config.get(
                 'PROMPT_STRICT_MODE',
                 self.openai_config.get('PROMPT_MODE', 'builtin'),
@@ -520,21 +1079,12 @@ class LLMRequester:
             user_text=self.openai_config.get('PROMPT_STRICT_TEXT', ''),
             target_language=target_language,
         )
+        self._strict_system_prompt_cache[target_language] = prompt
+        return prompt
     
     def _build_structured_user_prompt(self, texts: List[str]) -> str:
-        """构建结构化用户提示词。"""
-        return json.dumps(
-            {
-                "task": "subtitle_translation",
-                "requirements": {
-                    "one_to_one_alignment": True,
-                    "no_cross_item_carryover": True,
-                    "keep_fragment_boundaries": True,
-                },
-                "texts": texts,
-            },
-            ensure_ascii=False,
-        )
+        """构建结构化用户提示词：固定前缀 + 本批原文数组。"""
+        return f"{_USER_PROMPT_PREFIX}{json_dumps_fast(list(texts))}}}"
 
     def _parse_structured_translation_result(self, message, expected_count: int, batch_id: str) -> List[str]:
         """解析结构化翻译结果"""
@@ -542,30 +1092,25 @@ class LLMRequester:
             json_result = extract_chat_message_json(message, expected_type=dict)
             # 如果首次解析失败，尝试清洗 ASS 标签后重试
             if not isinstance(json_result, dict):
-                import re as _re
                 raw_text = get_chat_message_text(message)
-                cleaned_text = _re.sub(r'\\[hHnN]', ' ', raw_text)
-                cleaned_text = _re.sub(r'{\\[^}]*}', '', cleaned_text)
-                from .utils import extract_json_from_text
+                cleaned_text = _ASS_LINE_BREAK_RE.sub(' ', raw_text)
+                cleaned_text = _ASS_OVERRIDE_TAG_RE.sub('', cleaned_text)
                 json_result = extract_json_from_text(cleaned_text, expected_type=dict)
             if not isinstance(json_result, dict):
                 preview = get_chat_message_text(message)
-                with self._log_lock:
-                    self.logger.warning(
-                        f"批次 {batch_id}: 未解析到有效JSON，响应预览: {preview[:200]}"
-                    )
+                self.logger.warning(
+                    f"批次 {batch_id}: 未解析到有效JSON，响应预览: {preview[:200]}"
+                )
                 return [""] * expected_count
 
             if "translations" not in json_result:
-                with self._log_lock:
-                    self.logger.warning(f"批次 {batch_id}: JSON响应缺少translations字段")
+                self.logger.warning(f"批次 {batch_id}: JSON响应缺少translations字段")
                 return [""] * expected_count
             
             translations = json_result["translations"]
             
             if not isinstance(translations, list):
-                with self._log_lock:
-                    self.logger.warning(f"批次 {batch_id}: translations不是数组格式")
+                self.logger.warning(f"批次 {batch_id}: translations不是数组格式")
                 return [""] * expected_count
             
             # 确保返回的翻译数量正确
@@ -573,23 +1118,25 @@ class LLMRequester:
                 translations.append("")  # 用空字符串填充
             
             # 截断多余的翻译，并清洗 ASS 标签
-            import re as _re
-            _ass_tag_re = _re.compile(r'\\[hHnN]|{\\[^}]*}')
             final_translations = []
             for t in translations[:expected_count]:
-                cleaned = _ass_tag_re.sub('', str(t or '')).strip()
-                cleaned = _re.sub(r'\s+', ' ', cleaned).strip()
+                cleaned = _ASS_TAG_RE.sub('', str(t or '')).strip()
+                cleaned = _WHITESPACE_RUN_RE.sub(' ', cleaned).strip()
                 final_translations.append(cleaned)
             
-            with self._log_lock:
-                self.logger.info(f"批次 {batch_id}: 成功解析 {len(final_translations)} 条翻译")
+            self.logger.info(f"批次 {batch_id}: 成功解析 {len(final_translations)} 条翻译")
             
             return final_translations
         except Exception as e:
-            with self._log_lock:
-                self.logger.error(f"批次 {batch_id}: 解析翻译结果失败: {e}")
+            self.logger.error(f"批次 {batch_id}: 解析翻译结果失败: {e}")
             return [""] * expected_count
 
+
+# 按扩展名分派读写方法（SubtitleReader / SubtitleWriter 上的方法名）
+_SUBTITLE_READERS = {'.srt': 'read_srt', '.vtt': 'read_vtt'}
+_SUBTITLE_WRITERS = {'.srt': 'write_srt', '.vtt': 'write_vtt'}
+
+
 class SubtitleTranslator:
     """字幕翻译器主类"""
     
@@ -608,11 +1155,13 @@ class SubtitleTranslator:
             'OPENAI_MODEL_NAME': config.model_name or 'gpt-3.5-turbo',
             'OPENAI_THINKING_ENABLED': str(config.thinking_enabled).strip().lower() in ('true', '1', 'on', 'yes'),
             'OPENAI_TIMEOUT_SECONDS': config.timeout_seconds,
+            'SOURCE_LANGUAGE': config.source_language or 'auto',
             # Prompt 中心配置（快照，避免热修改影响进行中的翻译）
             'PROMPT_MODE': getattr(config, 'prompt_mode', 'builtin'),
             'PROMPT_TEXT': getattr(config, 'prompt_text', ''),
             'PROMPT_STRICT_MODE': getattr(config, 'prompt_strict_mode', 'builtin'),
             'PROMPT_STRICT_TEXT': getattr(config, 'prompt_strict_text', ''),
+            'TRANSLATION_CACHE_ENABLED': bool(getattr(config, 'persistent_cache_enabled', False)),
         }
         
         self.llm_requester = LLMRequester(self.openai_config, task_id)
@@ -635,16 +1184,12 @@ class SubtitleTranslator:
         - 以严格模式仅翻译这些条目，写回文件（默认覆盖原文件）。
         """
         try:
-            from pathlib import Path as _Path
-            fp = _Path(input_path)
-            ext = fp.suffix.lower()
-            if ext == '.srt':
-                items = self.reader.read_srt(input_path)
-            elif ext == '.vtt':
-                items = self.reader.read_vtt(input_path)
-            else:
+            ext = os.path.splitext(input_path)[1].lower()
+            reader_name = _SUBTITLE_READERS.get(ext)
+            if reader_name is None:
                 self.logger.error(f"不支持的字幕格式: {ext}")
                 return False
+            items = getattr(self.reader, reader_name)(input_path)
 
             if not items:
                 self.logger.warning("文件为空或解析失败，跳过修复")
@@ -659,7 +1204,7 @@ class SubtitleTranslator:
                 if self._contains_chinese(t):
                     continue
                 # 若包含字母或数字则判定为待修复
-                if re.search(r"[A-Za-z0-9]", t):
+                if _LATIN_ALNUM_RE.search(t):
                     targets.append(i)
 
             if not targets:
@@ -669,19 +1214,21 @@ class SubtitleTranslator:
             texts = [items[i].source_text for i in targets]
             self.logger.info(f"快速修复：共 {len(texts)} 条待补译")
 
-            # 使用严格模式批量翻译，尽量输出全中文
-            translations = self.llm_requester.translate_batch_strict(
-                texts, self.config.target_language, batch_id=f"quick_repair_{self.task_id}"
-            )
+            # 使用严格模式按 Token 预算分批翻译，尽量输出全中文，避免单次请求超出输出上限
+            for n, (start, end) in enumerate(self._pack_batches(texts, max_items=_QUICK_REPAIR_MAX_ITEMS), 1):
+                translations = self.llm_requester.translate_batch_strict(
+                    texts[start:end], self.config.target_language,
+                    batch_id=f"quick_repair_{self.task_id}_{n}"
+                )
 
-            # 写回对应条目（只改这些行）
-            for j, idx in enumerate(targets):
-                try:
-                    tr = translations[j] if j < len(translations) else ''
-                    if tr:
-                        items[idx].translated_text = self._sanitize_translated_text(tr)
-                except Exception:
-                    pass
+                # 写回对应条目（只改这些行）
+                for j, idx in enumerate(targets[start:end]):
+                    try:
+                        tr = translations[j] if j < len(translations) else ''
+                        if tr:
+                            items[idx].translated_text = self._sanitize_translated_text(tr)
+                    except Exception:
+                        pass
 
             # 输出到目标文件（默认覆盖原文件）
             out_path = str(output_path or input_path)
@@ -697,8 +1244,7 @@ class SubtitleTranslator:
 
         except Exception as e:
             self.logger.error(f"快速修复失败: {e}")
-            import traceback as _tb
-            self.logger.error(_tb.format_exc())
+            self.logger.error(traceback.format_exc())
             return False
     
     def translate_file(self, input_path: str, output_path: str,
@@ -707,14 +1253,12 @@ class SubtitleTranslator:
         """翻译字幕文件，使用多线程并发翻译"""
         try:
             # 检测文件格式并读取
-            file_ext = Path(input_path).suffix.lower()
-            if file_ext == '.srt':
-                items = self.reader.read_srt(input_path)
-            elif file_ext == '.vtt':
-                items = self.reader.read_vtt(input_path)
-            else:
+            file_ext = os.path.splitext(input_path)[1].lower()
+            reader_name = _SUBTITLE_READERS.get(file_ext)
+            if reader_name is None:
                 self.logger.error(f"不支持的字幕格式: {file_ext}")
                 return False
+            items = getattr(self.reader, reader_name)(input_path)
             
             if not items:
                 self.logger.error("未读取到字幕内容")
@@ -727,7 +1271,6 @@ class SubtitleTranslator:
             
         except Exception as e:
             self.logger.error(f"翻译字幕文件失败: {e}")
-            import traceback
             self.logger.error(traceback.format_exc())
             return False
     
@@ -737,74 +1280,53 @@ class SubtitleTranslator:
         """使用多线程并发翻译"""
         try:
             total_items = len(items)
-            batch_size = self.config.batch_size
-            # 允许不设上限：当配置为0或小于1时，按需要的批次数动态分配
-            required_workers = max(1, (total_items + batch_size - 1) // batch_size)
-            if isinstance(self.config.max_workers, int) and self.config.max_workers > 0:
-                max_workers = min(self.config.max_workers, required_workers)
-            else:
-                max_workers = required_workers
-            
-            # 内存感知处理：在高内存使用时降低并发数
-            try:
-                import psutil  # type: ignore
-            except Exception:
-                psutil = None
-
-            if psutil:
-                try:
-                    memory = psutil.virtual_memory()
-                    if memory.percent > 80.0:
-                        max_workers = max(1, max_workers // 2)
-                        self.logger.info(f"检测到高内存使用({memory.percent:.1f}%)，降低并发数至 {max_workers}")
-                except Exception:
-                    pass
-            
-            self.logger.info(f"开始并发翻译，批次大小: {batch_size}, 并发线程数: {max_workers}")
-            
-            # 创建批次
-            batches = []
-            for i in range(0, total_items, batch_size):
-                batch_items = items[i:i + batch_size]
-                batch_texts = [item.source_text for item in batch_items]
-                batches.append({
-                    'batch_id': f"{self.task_id}_{i//batch_size + 1}",
-                    'start_index': i,
-                    'items': batch_items,
-                    'texts': batch_texts
-                })
+            batch_size = self._batch_item_limit()
+            # 原文列只提取一次，批次直接切片：(batch_id, 字幕切片, 原文切片)
+            source_texts = [item.source_text for item in items]
+            batches = [
+                (f"{self.task_id}_{n}", items[start:end], source_texts[start:end])
+                for n, (start, end) in enumerate(self._pack_batches(source_texts), 1)
+            ]
+            max_workers = self._resolve_max_workers(len(batches))
+
+            self.logger.info(
+                f"开始并发翻译，批次条数上限: {batch_size}, 批次Token上限: {self.config.max_batch_tokens}, "
+                f"批次数: {len(batches)}, 并发线程数: {max_workers}"
+            )
             
             # 进度跟踪
             completed_items = 0
             progress_lock = Lock()
+            # 出现不可重试错误后通知其他批次尽快退出
+            fatal_event = Event()
             
             def update_progress(batch_size):
                 nonlocal completed_items
+                # 锁内只做计数，回调（会写数据库）与日志放到锁外，避免串行化工作线程
                 with progress_lock:
                     completed_items += batch_size
-                    # 始终计算 progress，避免在未传入 progress_callback 时未绑定变量
-                    progress = (completed_items / total_items) * 100
-                    if progress_callback:
-                        progress_callback(progress, completed_items, total_items)
-                    # 将逐条翻译进度降低到 debug 级别，保留网页上显示的进度
-                    self.logger.debug(f"翻译进度: {completed_items}/{total_items} ({progress:.1f}%)")
+                    completed = completed_items
+                progress = (completed / total_items) * 100
+                if progress_callback:
+                    progress_callback(progress, completed, total_items)
+                # 将逐条翻译进度降低到 debug 级别，保留网页上显示的进度
+                self.logger.debug(f"翻译进度: {completed}/{total_items} ({progress:.1f}%)")
             
-            def translate_batch_worker(batch_info):
+            def translate_batch_worker(batch_id, batch_items, batch_texts):
                 """单个批次翻译工作函数"""
-                batch_id = batch_info['batch_id']
-                start_index = batch_info['start_index']
-                batch_items = batch_info['items']
-                batch_texts = batch_info['texts']
-                
                 # 翻译当前批次，带重试机制
                 for retry in range(self.config.max_retries):
                     try:
                         if cancel_event is not None and cancel_event.is_set():
                             return False
+                        if fatal_event.is_set():
+                            return False
+                        # 重试时绕过缓存，避免重复命中同一无效译文
                         translations = self.llm_requester.translate_batch(
                             batch_texts, 
                             self.config.target_language,
-                            batch_id=batch_id
+                            batch_id=batch_id,
+                            use_cache=(retry == 0),
                         )
                         
                         # 将翻译结果赋值给字幕项
@@ -815,12 +1337,23 @@ class SubtitleTranslator:
                         invalid_translations = [
                             idx for idx, batch_item in enumerate(batch_items)
                             if self._likely_untranslated(
-                                batch_item.source_text,
+                                batch_texts[idx],
                                 batch_item.translated_text,
                             )
                         ]
                         if len(invalid_translations) == len(batch_items):
                             raise RuntimeError("整批译文均未通过有效性检查")
+
+                        # 只缓存通过检查的译文，避免把原样回显等无效结果复用到后续重复行
+                        invalid_set = set(invalid_translations)
+                        self.llm_requester.remember_translations(
+                            [
+                                (batch_texts[idx], batch_item.translated_text)
+                                for idx, batch_item in enumerate(batch_items)
+                                if idx not in invalid_set
+                            ],
+                            self.config.target_language,
+                        )
                         
                         # 更新进度
                         update_progress(len(batch_items))
@@ -830,9 +1363,17 @@ class SubtitleTranslator:
                     except TaskCancelledError:
                         raise
                     except Exception as e:
+                        if _is_fatal_api_error(e):
+                            fatal_event.set()
+                            raise _FatalTranslationError(f"批次 {batch_id} 遇到不可重试的接口错误: {e}") from e
                         self.logger.warning(f"批次 {batch_id} 翻译失败 (重试 {retry + 1}/{self.config.max_retries}): {e}")
                         if retry < self.config.max_retries - 1:
-                            time.sleep(self.config.retry_delay)
+                            delay = _compute_retry_delay(self.config.retry_delay, retry, e)
+                            # 退避期间可被取消请求提前唤醒
+                            if cancel_event is not None:
+                                cancel_event.wait(delay)
+                            else:
+                                time.sleep(delay)
                         else:
                             # 最后一次重试失败，保留空译文，交由后续补翻/验收决定是否继续
                             for j in range(len(batch_items)):
@@ -844,25 +1385,42 @@ class SubtitleTranslator:
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # 提交所有批次任务
                 future_to_batch = {
-                    executor.submit(translate_batch_worker, batch): batch
+                    executor.submit(translate_batch_worker, *batch): batch
                     for batch in batches
                 }
                 
-                # 等待所有任务完成
+                # 等待所有任务完成；出现不可重试错误时立即取消尚未开始的批次
+                done, not_done = concurrent.futures.wait(
+                    future_to_batch, return_when=concurrent.futures.FIRST_EXCEPTION
+                )
+                if not_done:
+                    for future in not_done:
+                        future.cancel()
+                    done |= concurrent.futures.wait(not_done)[0]
+
+                if cancel_event is not None and cancel_event.is_set():
+                    self.logger.info("检测到任务取消请求，终止字幕翻译")
+                    return False
+
                 successful_batches = 0
-                for future in concurrent.futures.as_completed(future_to_batch):
+                fatal_error = None
+                for future in done:
+                    if future.cancelled():
+                        continue
                     batch = future_to_batch[future]
                     try:
-                        if cancel_event is not None and cancel_event.is_set():
-                            self.logger.info("检测到任务取消请求，终止字幕翻译")
-                            return False
-                        success = future.result()
-                        if success:
+                        if future.result():
                             successful_batches += 1
                     except TaskCancelledError:
                         raise
+                    except _FatalTranslationError as e:
+                        fatal_error = fatal_error or e
                     except Exception as e:
-                        self.logger.error(f"批次 {batch['batch_id']} 执行异常: {e}")
+                        self.logger.error(f"批次 {batch[0]} 执行异常: {e}")
+
+                if fatal_error is not None:
+                    self.logger.error(f"字幕翻译提前终止: {fatal_error}")
+                    return False
                 
                 self.logger.info(f"并发翻译完成，成功批次: {successful_batches}/{len(batches)}")
             
@@ -879,6 +1437,15 @@ class SubtitleTranslator:
             if not self._finalize_residual_untranslated_items(items):
                 return False
 
+            # 只把通过验收的译文写入持久缓存，避免固化漏译结果
+            self.llm_requester.store_persistent_translations(
+                [
+                    (item.source_text, item.translated_text) for item in items
+                    if not self._likely_untranslated(item.source_text, item.translated_text)
+                ],
+                self.config.target_language,
+            )
+
             # 输出翻译后的文件
             return self._write_translated_file(items, output_path)
             
@@ -887,10 +1454,69 @@ class SubtitleTranslator:
             raise
         except Exception as e:
             self.logger.error(f"并发翻译过程中发生错误: {e}")
-            import traceback
             self.logger.error(traceback.format_exc())
             return False
 
+    def _resolve_max_workers(self, batch_count: int) -> int:
+        """按批次数确定并发线程数（主流程与补翻共用）。
+
+        配置为0或小于1时视为不设上限，按需要的批次数动态分配，但不超过 _AUTO_MAX_WORKERS，
+        避免长字幕一次拉起上百个线程；高内存使用时并发数减半。
+        """
+        required_workers = max(1, batch_count)
+        if isinstance(self.config.max_workers, int) and self.config.max_workers > 0:
+            max_workers = min(self.config.max_workers, required_workers)
+        else:
+            max_workers = min(_AUTO_MAX_WORKERS, required_workers)
+
+        # 内存感知处理：在高内存使用时降低并发数
+        memory_percent = _cached_memory_percent()
+        if memory_percent is not None and memory_percent > 80.0:
+            max_workers = max(1, max_workers // 2)
+            self.logger.info(f"检测到高内存使用({memory_percent:.1f}%)，降低并发数至 {max_workers}")
+        return max_workers
+
+    def _batch_item_limit(self) -> int:
+        """单批条数上限：始终为用户配置的 batch_size，Token 预算只会让批次提前结束。"""
+        return max(1, int(self.config.batch_size or 1))
+
+    def _pack_batches(self, source_texts: List[str], max_items: Optional[int] = None) -> List[tuple]:
+        """按 Token 预算贪心打包批次，返回 (start, end) 区间列表。
+
+        每批最多 batch_size 条（max_items 可覆盖该上限）。max_batch_tokens > 0 时，
+        若加入下一条会使原文估算 Token 超出预算，或估算的 JSON 译文回复超出
+        _OUTPUT_TOKEN_BUDGET，则提前结束当前批；单条超预算时独占一批。
+        max_batch_tokens 为 0 时只按条数上限固定切分。
+        """
+        total = len(source_texts)
+        batch_size = max(1, int(max_items)) if max_items else self._batch_item_limit()
+        token_budget = int(self.config.max_batch_tokens or 0)
+        if token_budget <= 0:
+            return [(i, min(i + batch_size, total)) for i in range(0, total, batch_size)]
+
+        model_name = self.config.model_name
+        ranges: List[tuple] = []
+        start = 0
+        current_tokens = 0
+        current_output = 0
+        for i, text in enumerate(source_texts):
+            tokens = _estimate_tokens(text, model_name)
+            output_tokens = int(tokens * _OUTPUT_EXPANSION) + _ITEM_JSON_OVERHEAD_TOKENS
+            if i > start and (
+                i - start >= batch_size
+                or current_tokens + tokens > token_budget
+                or current_output + output_tokens > _OUTPUT_TOKEN_BUDGET
+            ):
+                ranges.append((start, i))
+                start = i
+                current_tokens = 0
+                current_output = 0
+            current_tokens += tokens
+            current_output += output_tokens
+        if start < total:
+            ranges.append((start, total))
+        return ranges
+
     def _likely_untranslated(self, src: str, dst: str) -> bool:
         """判断翻译是否可能未生效：空串、与原文相同、非中文比例过高。
 
@@ -898,33 +1524,8 @@ class SubtitleTranslator:
         当 非中文/(中文+非中文) > 0.8 时，认为疑似未翻译。
         """
         try:
-            s = (src or '').strip()
-            d = (dst or '').strip()
-            if not d:
-                return True
-            if d == s:
-                # 若目标语言是中文但结果与原文一致，多半未翻译
-                return True
-            # 计算非中文比例（仅中文汉字 vs 英数）
-            chinese = 0
-            non_chinese = 0
-            for ch in d:
-                if ch.isspace():
-                    continue
-                # 中文汉字范围
-                code = ord(ch)
-                if 0x4E00 <= code <= 0x9FFF:
-                    chinese += 1
-                elif re.match(r"[A-Za-z0-9]", ch):
-                    non_chinese += 1
-                else:
-                    # 忽略标点/符号/表情，不计入分母
-                    continue
-            denom = chinese + non_chinese
-            if denom == 0:
-                return False
-            non_cn_ratio = non_chinese / denom
-            return non_cn_ratio > 0.8
+            config = getattr(self, 'config', None)
+            return _is_likely_untranslated(src or '', dst or '', getattr(config, 'target_language', 'zh'))
         except Exception:
             return False
 
@@ -978,101 +1579,81 @@ class SubtitleTranslator:
                 return
             self.logger.info(f"检测到 {len(to_fix_indices)} 条疑似未翻译条目，开始补翻...")
 
-            bs = max(1, int(self.config.batch_size) if self.config.batch_size else 5)
-            for i in range(0, len(to_fix_indices), bs):
-                chunk = to_fix_indices[i:i+bs]
-                texts = [items[idx].source_text for idx in chunk]
-                try:
-                    translations = self.llm_requester.translate_batch(texts, self.config.target_language, batch_id=f"repair_{self.task_id}_{i//bs+1}")
-                except Exception as e:
-                    self.logger.warning(f"补翻批次失败，跳过该批：{e}")
-                    continue
-                for j, idx in enumerate(chunk):
-                    try:
-                        tr = translations[j] if j < len(translations) else ''
-                        if tr and self._likely_untranslated(items[idx].source_text, tr) is False:
-                            items[idx].translated_text = self._sanitize_translated_text(tr)
-                    except Exception:
-                        pass
+            # 补翻批次同样按条数与 Token 预算打包；各批次写回的条目互不重叠，可并发执行
+            fix_texts = [items[idx].source_text for idx in to_fix_indices]
+            ranges = self._pack_batches(fix_texts)
+            max_workers = self._resolve_max_workers(len(ranges))
 
-            # 再次扫描仍未译的条目，使用严格模式再尝试一次
-            still_untranslated = self._collect_untranslated_indices(items)
-            if not still_untranslated:
-                return
-            self.logger.info(f"仍有 {len(still_untranslated)} 条未充分翻译，启动严格模式补救...")
-            bs2 = max(1, int(self.config.batch_size) if self.config.batch_size else 5)
-            for i in range(0, len(still_untranslated), bs2):
-                chunk = still_untranslated[i:i+bs2]
-                texts = [items[idx].source_text for idx in chunk]
-                try:
-                    translations = self.llm_requester.translate_batch_strict(texts, self.config.target_language, batch_id=f"repair_strict_{self.task_id}_{i//bs2+1}")
-                except Exception as e:
-                    self.logger.warning(f"严格模式补翻批次失败，跳过该批：{e}")
-                    continue
-                for j, idx in enumerate(chunk):
-                    try:
-                        tr = translations[j] if j < len(translations) else ''
-                        if tr and self._likely_untranslated(items[idx].source_text, tr) is False:
-                            items[idx].translated_text = self._sanitize_translated_text(tr)
-                    except Exception:
-                        pass
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._repair_chunk, items, n, to_fix_indices[start:end], fix_texts[start:end])
+                    for n, (start, end) in enumerate(ranges, 1)
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
         except Exception as e:
             self.logger.warning(f"补翻流程出现异常：{e}")
 
+    def _apply_repair_translations(self, items: List[SubtitleItem], chunk: List[int], translations: List[str]):
+        for j, idx in enumerate(chunk):
+            try:
+                tr = translations[j] if j < len(translations) else ''
+                if tr and self._likely_untranslated(items[idx].source_text, tr) is False:
+                    items[idx].translated_text = self._sanitize_translated_text(tr)
+            except Exception:
+                pass
+
+    def _repair_chunk(self, items: List[SubtitleItem], n: int, chunk: List[int], texts: List[str]):
+        """补翻单个批次：先常规补翻，本批仍未译的条目紧接着用严格模式再尝试一次。
+
+        批内重复的原文（如 [Music]、人名、语气词）只请求一次，结果按原文回填到各条目。
+        """
+        try:
+            unique_texts = list(dict.fromkeys(texts))
+            translations = self.llm_requester.translate_batch(
+                unique_texts,
+                self.config.target_language,
+                batch_id=f"repair_{self.task_id}_{n}",
+                use_cache=False,
+            )
+            by_text = dict(zip(unique_texts, translations))
+            self._apply_repair_translations(items, chunk, [by_text.get(text, '') for text in texts])
+        except Exception as e:
+            self.logger.warning(f"补翻批次失败，转严格模式：{e}")
+
+        remaining = [idx for idx in chunk if self._likely_untranslated(items[idx].source_text, items[idx].translated_text)]
+        if not remaining:
+            return
+        self.logger.info(f"补翻批次 {n} 仍有 {len(remaining)} 条未充分翻译，启动严格模式补救...")
+        remaining_texts = [items[idx].source_text for idx in remaining]
+        unique_texts = list(dict.fromkeys(remaining_texts))
+        try:
+            translations = self.llm_requester.translate_batch_strict(
+                unique_texts,
+                self.config.target_language,
+                batch_id=f"repair_strict_{self.task_id}_{n}",
+            )
+        except Exception as e:
+            self.logger.warning(f"严格模式补翻批次失败，跳过该批：{e}")
+            return
+        by_text = dict(zip(unique_texts, translations))
+        self._apply_repair_translations(items, remaining, [by_text.get(text, '') for text in remaining_texts])
+
     def _sanitize_translated_text(self, text: str) -> str:
         """清洗译文：移除无关的序号/项目符号/引号，合并重复行"""
         if not text:
             return text
-        try:
-            # 标准化换行
-            lines = [line.strip() for line in str(text).split('\n')]
-            cleaned_lines: List[str] = []
-            seen: set = set()
-
-            for line in lines:
-                if not line:
-                    continue
-                original = line
-                # 反复移除前置编号或项目符号（最多10次防止无限循环）
-                for _ in range(10):
-                    new_line = re.sub(r'^(?:[\(（]?\s*\d+\s*[\)）.:、]\s*|[-–—·•]\s+)', '', line)
-                    if new_line == line:
-                        break
-                    line = new_line.strip()
-
-                # 去除整行包裹引号
-                if ((line.startswith('"') and line.endswith('"')) or
-                    (line.startswith("'") and line.endswith("'")) or
-                    (line.startswith('“') and line.endswith('”')) or
-                    (line.startswith('‘') and line.endswith('’'))):
-                    line = line[1:-1].strip()
-
-                if not line:
-                    continue
-
-                # 去重（基于标准化后的小写文本）
-                key = line.strip().lower()
-                if key in seen:
-                    continue
-                seen.add(key)
-                cleaned_lines.append(line)
-
-            sanitized = '\n'.join(cleaned_lines).strip()
-            return SubtitleWriter._strip_terminal_full_stop(sanitized)
-        except Exception:
-            return SubtitleWriter._strip_terminal_full_stop(text.strip())
+        return _sanitize_cached(str(text))
     
     def _write_translated_file(self, items: List[SubtitleItem], output_path: str) -> bool:
         """写入翻译后的文件"""
         try:
-            output_ext = Path(output_path).suffix.lower()
-            if output_ext == '.srt':
-                self.writer.write_srt(items, output_path, translated=True)
-            elif output_ext == '.vtt':
-                self.writer.write_vtt(items, output_path, translated=True)
-            else:
+            output_ext = os.path.splitext(output_path)[1].lower()
+            writer_name = _SUBTITLE_WRITERS.get(output_ext)
+            if writer_name is None:
                 self.logger.error(f"不支持的输出格式: {output_ext}")
                 return False
+            getattr(self.writer, writer_name)(items, output_path, translated=True)
             
             self.logger.info(f"字幕翻译完成: {output_path}")
             return True
@@ -1084,13 +1665,10 @@ class SubtitleTranslator:
     def get_subtitle_preview(self, file_path: str, max_items: int = 5) -> List[Dict]:
         """获取字幕预览"""
         try:
-            file_ext = Path(file_path).suffix.lower()
-            if file_ext == '.srt':
-                items = self.reader.read_srt(file_path)
-            elif file_ext == '.vtt':
-                items = self.reader.read_vtt(file_path)
-            else:
+            reader_name = _SUBTITLE_READERS.get(os.path.splitext(file_path)[1].lower())
+            if reader_name is None:
                 return []
+            items = getattr(self.reader, reader_name)(file_path, max_items=max_items)
             
             preview_items = items[:max_items]
             return [
@@ -1113,23 +1691,6 @@ def create_translator_from_config(app_config: Dict, task_id: Optional[str] = Non
         # 添加调试日志：检查配置值是否为 None
         logger.debug(f"create_translator_from_config 调用，task_id: {task_id}")
         
-        # 确保数值配置被正确转换为整数
-        batch_size = app_config.get('SUBTITLE_BATCH_SIZE', 3)  # 降低默认批次大小
-        if isinstance(batch_size, str):
-            batch_size = int(batch_size)
-        
-        max_retries = app_config.get('SUBTITLE_MAX_RETRIES', 3)
-        if isinstance(max_retries, str):
-            max_retries = int(max_retries)
-        
-        retry_delay = app_config.get('SUBTITLE_RETRY_DELAY', 2)
-        if isinstance(retry_delay, str):
-            retry_delay = int(retry_delay)
-        
-        max_workers = app_config.get('SUBTITLE_MAX_WORKERS', 2)  # 降低默认并发数
-        if isinstance(max_workers, str):
-            max_workers = int(max_workers)
-        
         # 计算字幕翻译专用Base URL（优先使用SUBTITLE_OPENAI_BASE_URL，否则回退到OPENAI_BASE_URL）
         subtitle_base_url = app_config.get('SUBTITLE_OPENAI_BASE_URL') or app_config.get('OPENAI_BASE_URL', 'https://api.openai.com/v1')
 
@@ -1159,12 +1720,14 @@ def create_translator_from_config(app_config: Dict, task_id: Optional[str] = Non
             api_key=subtitle_api_key,
             base_url=subtitle_base_url,
             model_name=subtitle_model,
-            batch_size=batch_size,
-            max_retries=max_retries,
-            retry_delay=retry_delay,
-            max_workers=max_workers,
+            batch_size=app_config.get('SUBTITLE_BATCH_SIZE', 3),
+            max_retries=app_config.get('SUBTITLE_MAX_RETRIES', 3),
+            retry_delay=app_config.get('SUBTITLE_RETRY_DELAY', 2),
+            max_workers=app_config.get('SUBTITLE_MAX_WORKERS', 2),
+            max_batch_tokens=app_config.get('SUBTITLE_MAX_BATCH_TOKENS', 3000),
+            persistent_cache_enabled=str(app_config.get('SUBTITLE_TRANSLATION_CACHE_ENABLED', False)).strip().lower() in ('true', '1', 'on', 'yes'),
             thinking_enabled=app_config.get('SUBTITLE_OPENAI_THINKING_ENABLED', False),
-            timeout_seconds=int(app_config.get('OPENAI_TIMEOUT_SECONDS', 600)),
+            timeout_seconds=app_config.get('OPENAI_TIMEOUT_SECONDS', 600),
             prompt_mode=prompt_mode,
             prompt_text=prompt_text,
             prompt_strict_mode=prompt_strict_mode,
@@ -3,6 +3,8 @@
 
 import os
 import time
+import atexit
+import weakref
 import json
 import uuid
 import sqlite3
@@ -13,14 +15,14 @@ import threading
 import gc
 import shlex
 from datetime import datetime, timedelta
-from logging.handlers import RotatingFileHandler
+from functools import lru_cache
 import re
 import unicodedata
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.executors.pool import ThreadPoolExecutor as APSchedulerThreadPoolExecutor
 from apscheduler.schedulers.base import SchedulerNotRunningError
 import queue
-from .utils import get_app_subdir
+from .utils import attach_queued_file_handler, get_app_subdir, json_dumps_fast, json_loads_fast
 from .ffmpeg_manager import get_ffmpeg_path, get_ffprobe_path
 from .notifications import (
     EVENT_TASK_ADDED,
@@ -62,6 +64,7 @@ def _should_reduce_concurrency():
     return memory_percent > 80.0  # 内存使用超过80%时降低并发
 
 # 全局变量
+APP_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_DIR = get_app_subdir('db')
 os.makedirs(DB_DIR, exist_ok=True)
 DB_PATH = os.path.join(DB_DIR, 'tasks.db')
@@ -72,6 +75,13 @@ DB_CONNECT_TIMEOUT_SECONDS = 10
 DB_BUSY_TIMEOUT_MS = 30000
 DB_WRITE_RETRY_TIMES = 5
 DB_WRITE_RETRY_SLEEP_SECONDS = 0.2
+# 网页进度显示的最小写库间隔（秒），下载/转码进度回调频率远高于页面刷新频率
+PROGRESS_WRITE_MIN_INTERVAL_SECONDS = 1.0
+
+# 内容审核前过滤推广信息（URL/邮箱）及多余空行
+_MODERATION_URL_RE = re.compile(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+')
+_MODERATION_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_EXCESS_BLANK_LINES_RE = re.compile(r'\n{3,}')
 
 
 def _convert_vtt_text_to_srt_text(vtt_content: str) -> str:
@@ -426,8 +436,7 @@ def resolve_cookie_file_path(
     if not raw_path:
         return ''
 
-    app_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    resolved_path = raw_path if os.path.isabs(raw_path) else os.path.join(app_root, raw_path)
+    resolved_path = raw_path if os.path.isabs(raw_path) else os.path.join(APP_ROOT_DIR, raw_path)
     resolved_path = os.path.normpath(resolved_path)
 
     if os.path.exists(resolved_path):
@@ -594,7 +603,7 @@ def _safe_json_loads(value, default):
         s = str(value).strip()
         if not s:
             return default
-        return json.loads(s)
+        return json_loads_fast(s)
     except Exception:
         return default
 
@@ -760,7 +769,7 @@ def _persist_pipeline_checkpoint(task_id, completed_stages):
         'completed': stages,
         'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
     }
-    update_task(task_id, silent=True, **{PIPELINE_CHECKPOINT_FIELD: json.dumps(payload, ensure_ascii=False)})
+    update_task(task_id, silent=True, **{PIPELINE_CHECKPOINT_FIELD: json_dumps_fast(payload)})
 
 
 def _mark_stage_done(task_id, completed_stages, stage):
@@ -788,7 +797,8 @@ def recover_interrupted_tasks_to_pending():
             return 0
 
         now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        recovered = 0
+        # 收集 (新状态, 更新时间, 任务ID)，最后一次 executemany 写入
+        status_rows = []
 
         for row in rows:
             task_id = row['id']
@@ -808,30 +818,20 @@ def recover_interrupted_tasks_to_pending():
 
             # 若上传响应已存在，直接标记为 completed（避免重复上传）
             if has_upload_resp:
-                conn.execute(
-                    'UPDATE tasks SET status = ?, updated_at = ? WHERE id = ?',
-                    (TASK_STATES['COMPLETED'], now_str, task_id)
-                )
-                recovered += 1
+                status_rows.append((TASK_STATES['COMPLETED'], now_str, task_id))
                 continue
 
             # 双平台仅部分成功：恢复为 failed，让 process_task 走“失败点续传”只补失败平台
             if has_partial_upload_resp:
-                conn.execute(
-                    'UPDATE tasks SET status = ?, updated_at = ? WHERE id = ?',
-                    (TASK_STATES['FAILED'], now_str, task_id)
-                )
-                recovered += 1
+                status_rows.append((TASK_STATES['FAILED'], now_str, task_id))
                 continue
 
             # 其他处理中状态：恢复为 pending，由流水线根据checkpoint跳过已完成阶段
-            conn.execute(
-                'UPDATE tasks SET status = ?, updated_at = ? WHERE id = ?',
-                (TASK_STATES['PENDING'], now_str, task_id)
-            )
-            recovered += 1
+            status_rows.append((TASK_STATES['PENDING'], now_str, task_id))
 
+        conn.executemany('UPDATE tasks SET status = ?, updated_at = ? WHERE id = ?', status_rows)
         conn.commit()
+        recovered = len(status_rows)
         if recovered:
             logger.info(f"断点续跑：已恢复 {recovered} 个处理中任务为 pending")
         return recovered
@@ -843,6 +843,12 @@ def recover_interrupted_tasks_to_pending():
 
 # WebSocket实时通知功能已移除，改为使用传统页面刷新方式
 
+# 任务处理日志
+_TASK_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_TASK_LOGGERS = {}
+_TASK_LOGGERS_LOCK = threading.Lock()
+
+
 # 设置日志记录器
 def setup_logger(name):
     """
@@ -859,13 +865,10 @@ def setup_logger(name):
     if not logger.handlers:  # 避免重复添加处理器
         logger.setLevel(logging.INFO)
         
-        # 文件处理器
+        # 文件处理器 - 与任务日志共用监听线程写盘，调用线程只负责入队
         log_file = os.path.join(LOGS_DIR, f'{name}.log')
-        file_handler = RotatingFileHandler(log_file, maxBytes=10485760, backupCount=5, encoding='utf-8')
         file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
+        attach_queued_file_handler(logger, log_file, file_formatter, max_bytes=10485760, backup_count=5)
         
         # 控制台处理器
         console_handler = logging.StreamHandler()
@@ -925,10 +928,57 @@ def publish_task_event(event_type='refresh', data=None):
     }
     _emit_task_event(event_payload)
 
-# 任务处理日志
+# AcFun 分区映射为静态配置，按 (路径, mtime, 大小) 缓存解析结果，文件更新后自动重新读取
+_ACFUN_ID_MAPPING_CACHE = (None, None)  # ((路径, mtime_ns, 大小), 解析结果)，整体替换保证读取一致
+_ACFUN_ID_MAPPING_LOCK = threading.Lock()
+
+
+def _load_acfun_id_mapping(path):
+    """读取 AcFun 分区映射文件（带缓存）；文件不存在时返回 None。
+
+    返回的数据在多个任务间共享，调用方只读使用。
+    """
+    global _ACFUN_ID_MAPPING_CACHE
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    cached_key, cached_data = _ACFUN_ID_MAPPING_CACHE
+    if cached_key == key:
+        return cached_data
+    with _ACFUN_ID_MAPPING_LOCK:
+        cached_key, cached_data = _ACFUN_ID_MAPPING_CACHE
+        if cached_key == key:
+            return cached_data
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        _ACFUN_ID_MAPPING_CACHE = (key, data)
+        return data
+
+
+# yt-dlp 元数据（含完整格式列表）体积较大，只缓存上传流程用到的字段，按 (路径, mtime, 大小) 失效
+_TASK_METADATA_FIELDS = ('title', 'description', 'webpage_url', 'uploader', 'upload_date')
+
+
+@lru_cache(maxsize=256)
+def _read_task_metadata_fields(path, mtime_ns, size):
+    with open(path, 'rb') as f:
+        metadata = json_loads_fast(f.read())
+    return {key: metadata[key] for key in _TASK_METADATA_FIELDS if key in metadata}
+
+
+def _load_task_metadata(path):
+    """读取任务元数据 JSON 中的常用字段（带缓存），返回的字典调用方只读使用。"""
+    stat = os.stat(path)
+    return _read_task_metadata_fields(path, stat.st_mtime_ns, stat.st_size)
+
+
 def setup_task_logger(task_id):
     """
     为特定任务设置日志记录器
+
+    同一任务的记录器只初始化一次，后续调用直接返回缓存实例。
     
     Args:
         task_id: 任务ID
@@ -936,23 +986,30 @@ def setup_task_logger(task_id):
     Returns:
         logger: 配置好的日志记录器
     """
-    log_file = os.path.join(LOGS_DIR, f'task_{task_id}.log')
-    logger = logging.getLogger(f'task_{task_id}')
-    
-    if not logger.handlers:  # 避免重复添加处理器
-        logger.setLevel(logging.INFO)
+    cache_key = str(task_id)
+    cached = _TASK_LOGGERS.get(cache_key)
+    if cached is not None:
+        return cached
+
+    with _TASK_LOGGERS_LOCK:
+        cached = _TASK_LOGGERS.get(cache_key)
+        if cached is not None:
+            return cached
+
+        log_file = os.path.join(LOGS_DIR, f'task_{task_id}.log')
+        logger = logging.getLogger(f'task_{task_id}')
         
-        # 文件处理器 - 减少文件大小以降低内存使用
-        file_handler = RotatingFileHandler(log_file, maxBytes=5242880, backupCount=3, encoding='utf-8')
-        file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
+        if not logger.handlers:  # 避免重复添加处理器
+            logger.setLevel(logging.INFO)
+            
+            # 文件处理器 - 减少文件大小以降低内存使用；由共享监听线程写入
+            attach_queued_file_handler(logger, log_file, _TASK_LOG_FORMATTER, max_bytes=5242880, backup_count=3)
+            
+            # 确保消息不会传播到根日志记录器
+            logger.propagate = False
         
-        # 确保消息不会传播到根日志记录器
-        logger.propagate = False
-    
-    return logger
+        _TASK_LOGGERS[cache_key] = logger
+        return logger
 
 # 数据库操作
 def init_db():
@@ -1250,6 +1307,15 @@ def init_db():
         conn.commit()
     except Exception as e:
         logger.warning(f"数据库升级检查失败（可能已是最新版本）: {e}")
+
+    # 任务列表按状态筛选并按创建时间倒序，复合索引让筛选与排序走同一次 B-tree 扫描
+    try:
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at DESC)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at DESC)')
+        conn.execute('ANALYZE tasks')
+        conn.commit()
+    except Exception as e:
+        logger.warning(f"创建任务表索引失败: {e}")
     
     conn.close()
     
@@ -1259,16 +1325,59 @@ def get_db_path():
     """获取数据库文件路径"""
     return DB_PATH
 
+class _PooledConnection(sqlite3.Connection):
+    """线程内复用的数据库连接：close() 仅回滚未提交的事务并归还，不真正关闭。"""
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+
+_DB_LOCAL = threading.local()
+_DB_CONNECTIONS = weakref.WeakSet()
+_DB_CONNECTIONS_LOCK = threading.Lock()
+
+
+def _close_db_connections():
+    """进程退出时关闭各线程缓存的数据库连接"""
+    with _DB_CONNECTIONS_LOCK:
+        connections = list(_DB_CONNECTIONS)
+        _DB_CONNECTIONS.clear()
+    _DB_LOCAL.__dict__.pop('connection', None)
+    for conn in connections:
+        try:
+            sqlite3.Connection.close(conn)
+        except Exception:
+            pass
+
+
+atexit.register(_close_db_connections)
+
+
 def get_db_connection():
-    """获取数据库连接"""
-    conn = sqlite3.connect(DB_PATH, timeout=DB_CONNECT_TIMEOUT_SECONDS)
+    """获取当前线程复用的数据库连接（首次使用时创建并设置 PRAGMA）"""
+    cached = getattr(_DB_LOCAL, 'connection', None)
+    if cached is not None and cached[0] == DB_PATH:
+        return cached[1]
+
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=DB_CONNECT_TIMEOUT_SECONDS,
+        factory=_PooledConnection,
+        check_same_thread=False,
+        cached_statements=256,
+    )
     conn.row_factory = sqlite3.Row  # 返回字典形式的结果
     try:
         conn.execute(f'PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}')
         conn.execute('PRAGMA journal_mode = WAL')
         conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('PRAGMA temp_store = MEMORY')
     except Exception as e:
-        logger.debug(f"设置SQLite连接参数失败，将使用默认参数: {e}")
+        logger.debug("设置SQLite连接参数失败，将使用默认参数: %s", e)
+    _DB_LOCAL.connection = (DB_PATH, conn)
+    with _DB_CONNECTIONS_LOCK:
+        _DB_CONNECTIONS.add(conn)
     return conn
 
 def add_task(youtube_url, upload_target=None):
@@ -1340,6 +1449,45 @@ def add_task(youtube_url, upload_target=None):
 
     return task_id
 
+# update_task 白名单：只允许更新有效的列名（模块级常量，避免每次调用重建）
+_TASK_UPDATE_COLUMNS = {
+    'youtube_url': 'youtube_url = ?',
+    'upload_target': 'upload_target = ?',
+    'status': 'status = ?',
+    'created_at': 'created_at = ?',
+    'updated_at': 'updated_at = ?',
+    'video_title_original': 'video_title_original = ?',
+    'video_title_translated': 'video_title_translated = ?',
+    'description_original': 'description_original = ?',
+    'description_translated': 'description_translated = ?',
+    'tags_generated': 'tags_generated = ?',
+    'recommended_partition_id': 'recommended_partition_id = ?',
+    'selected_partition_id': 'selected_partition_id = ?',
+    'recommended_partition_id_acfun': 'recommended_partition_id_acfun = ?',
+    'selected_partition_id_acfun': 'selected_partition_id_acfun = ?',
+    'recommended_partition_id_bilibili': 'recommended_partition_id_bilibili = ?',
+    'selected_partition_id_bilibili': 'selected_partition_id_bilibili = ?',
+    'cover_path_local': 'cover_path_local = ?',
+    'video_path_local': 'video_path_local = ?',
+    'subtitle_path_original': 'subtitle_path_original = ?',
+    'subtitle_path_translated': 'subtitle_path_translated = ?',
+    'subtitle_language_detected': 'subtitle_language_detected = ?',
+    'subtitle_qc_failed': 'subtitle_qc_failed = ?',
+    'subtitle_qc_reason': 'subtitle_qc_reason = ?',
+    'subtitle_qc_score': 'subtitle_qc_score = ?',
+    'subtitle_qc_checked_at': 'subtitle_qc_checked_at = ?',
+    'metadata_json_path_local': 'metadata_json_path_local = ?',
+    'moderation_result': 'moderation_result = ?',
+    'error_message': 'error_message = ?',
+    'pipeline_checkpoint': 'pipeline_checkpoint = ?',
+    'upload_progress': 'upload_progress = ?',
+    'acfun_upload_response': 'acfun_upload_response = ?',
+    'bilibili_upload_response': 'bilibili_upload_response = ?',
+    'asr_warning_message': 'asr_warning_message = ?',
+    'subtitle_warning_message': 'subtitle_warning_message = ?',
+}
+_TASK_UPDATE_SQL_CACHE = {}
+
 def update_task(task_id, silent=False, **kwargs):
     """
     更新任务信息
@@ -1362,53 +1510,20 @@ def update_task(task_id, silent=False, **kwargs):
     # 添加更新时间
     kwargs['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-    # 白名单验证：只允许更新有效的列名
-    ALLOWED_COLUMNS = {
-        'youtube_url': 'youtube_url = ?',
-        'upload_target': 'upload_target = ?',
-        'status': 'status = ?',
-        'created_at': 'created_at = ?',
-        'updated_at': 'updated_at = ?',
-        'video_title_original': 'video_title_original = ?',
-        'video_title_translated': 'video_title_translated = ?',
-        'description_original': 'description_original = ?',
-        'description_translated': 'description_translated = ?',
-        'tags_generated': 'tags_generated = ?',
-        'recommended_partition_id': 'recommended_partition_id = ?',
-        'selected_partition_id': 'selected_partition_id = ?',
-        'recommended_partition_id_acfun': 'recommended_partition_id_acfun = ?',
-        'selected_partition_id_acfun': 'selected_partition_id_acfun = ?',
-        'recommended_partition_id_bilibili': 'recommended_partition_id_bilibili = ?',
-        'selected_partition_id_bilibili': 'selected_partition_id_bilibili = ?',
-        'cover_path_local': 'cover_path_local = ?',
-        'video_path_local': 'video_path_local = ?',
-        'subtitle_path_original': 'subtitle_path_original = ?',
-        'subtitle_path_translated': 'subtitle_path_translated = ?',
-        'subtitle_language_detected': 'subtitle_language_detected = ?',
-        'subtitle_qc_failed': 'subtitle_qc_failed = ?',
-        'subtitle_qc_reason': 'subtitle_qc_reason = ?',
-        'subtitle_qc_score': 'subtitle_qc_score = ?',
-        'subtitle_qc_checked_at': 'subtitle_qc_checked_at = ?',
-        'metadata_json_path_local': 'metadata_json_path_local = ?',
-        'moderation_result': 'moderation_result = ?',
-        'error_message': 'error_message = ?',
-        'pipeline_checkpoint': 'pipeline_checkpoint = ?',
-        'upload_progress': 'upload_progress = ?',
-        'acfun_upload_response': 'acfun_upload_response = ?',
-        'bilibili_upload_response': 'bilibili_upload_response = ?',
-        'asr_warning_message': 'asr_warning_message = ?',
-        'subtitle_warning_message': 'subtitle_warning_message = ?',
-    }
-
     # 过滤掉不在白名单中的列
-    filtered_items = [(k, v) for k, v in kwargs.items() if k in ALLOWED_COLUMNS]
+    filtered_items = [(k, v) for k, v in kwargs.items() if k in _TASK_UPDATE_COLUMNS]
     filtered_kwargs = dict(filtered_items)
 
     if not filtered_kwargs:
         return False
 
-    # 构建SQL更新语句
-    set_clause = ', '.join(ALLOWED_COLUMNS[key] for key, _ in filtered_items)
+    # 构建SQL更新语句（按列组合缓存，字段组合有限，预热后不再拼接字符串）
+    columns = tuple(key for key, _ in filtered_items)
+    update_sql = _TASK_UPDATE_SQL_CACHE.get(columns)
+    if update_sql is None:
+        set_clause = ', '.join(_TASK_UPDATE_COLUMNS[key] for key in columns)
+        update_sql = f'UPDATE tasks SET {set_clause} WHERE id = ?'
+        _TASK_UPDATE_SQL_CACHE[columns] = update_sql
     values = [value for _, value in filtered_items]
     values.append(task_id)
     
@@ -1419,10 +1534,7 @@ def update_task(task_id, silent=False, **kwargs):
                 existing_row = conn.execute('SELECT * FROM tasks WHERE id = ?', (task_id,)).fetchone()
                 existing_task = dict(existing_row) if existing_row else None
                 previous_status = existing_task.get('status') if existing_task else None
-                conn.execute(
-                    f'UPDATE tasks SET {set_clause} WHERE id = ?',
-                    values
-                )
+                conn.execute(update_sql, values)
                 conn.commit()
 
                 event_type = 'task_updated'
@@ -1499,6 +1611,28 @@ def update_task(task_id, silent=False, **kwargs):
     finally:
         conn.close()
 
+def _make_progress_writer(task_id, min_interval=PROGRESS_WRITE_MIN_INTERVAL_SECONDS):
+    """
+    返回节流后的进度写入函数：文本未变化时跳过，变化时按最小间隔写库
+
+    返回函数的 force=True 用于必须落库的进度（如 100%）。
+    """
+    last_text = None
+    last_write_at = 0.0
+
+    def write(progress_text, force=False):
+        nonlocal last_text, last_write_at
+        if progress_text == last_text:
+            return
+        now = time.monotonic()
+        if not force and now - last_write_at < min_interval:
+            return
+        last_text = progress_text
+        last_write_at = now
+        update_task(task_id, upload_progress=progress_text, silent=True)
+
+    return write
+
 def get_task(task_id):
     """
     获取任务信息
@@ -1509,13 +1643,13 @@ def get_task(task_id):
     Returns:
         task: 任务信息字典，如果不存在则返回None
     """
-    logger.debug(f"正在获取任务 {task_id}")
     conn = get_db_connection()
     try:
         cursor = conn.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
         task = cursor.fetchone()
         result = dict(task) if task else None
-        logger.debug(f"获取任务 {task_id} 结果: {result}")
+        # 惰性格式化：整行任务数据（含描述/JSON字段）仅在开启 DEBUG 时才转成字符串
+        logger.debug("获取任务 %s 结果: %s", task_id, result)
         return result
     except Exception as e:
         logger.error(f"获取任务 {task_id} 失败: {str(e)}")
@@ -1523,6 +1657,22 @@ def get_task(task_id):
     finally:
         conn.close()
 
+def iter_all_tasks():
+    """
+    逐条产出所有任务信息，避免一次性把整张表读入内存
+
+    迭代结束（或生成器被关闭）前会一直占用当前线程的数据库连接。
+
+    Yields:
+        task: 任务信息字典，按创建时间倒序
+    """
+    conn = get_db_connection()
+    try:
+        for row in conn.execute('SELECT * FROM tasks ORDER BY created_at DESC'):
+            yield dict(row)
+    finally:
+        conn.close()
+
 def get_all_tasks():
     """
     获取所有任务信息
@@ -1530,15 +1680,11 @@ def get_all_tasks():
     Returns:
         tasks: 任务信息列表
     """
-    conn = get_db_connection()
     try:
-        cursor = conn.execute('SELECT * FROM tasks ORDER BY created_at DESC')
-        return [dict(row) for row in cursor.fetchall()]
+        return list(iter_all_tasks())
     except Exception as e:
         logger.error(f"获取所有任务失败: {str(e)}")
         return []
-    finally:
-        conn.close()
 
 def get_tasks_paginated(page=1, per_page=20):
     """
@@ -1564,7 +1710,7 @@ def get_tasks_paginated(page=1, per_page=20):
         # 获取分页数据
         cursor = conn.execute('SELECT * FROM tasks ORDER BY created_at DESC LIMIT ? OFFSET ?', 
                             (per_page, offset))
-        tasks = [dict(row) for row in cursor.fetchall()]
+        tasks = [dict(row) for row in cursor]
         
         return {
             'tasks': tasks,
@@ -1606,7 +1752,7 @@ def get_tasks_by_status(status):
     conn = get_db_connection()
     try:
         cursor = conn.execute('SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC', (status,))
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
     except Exception as e:
         logger.error(f"获取{status}状态任务失败: {str(e)}")
         return []
@@ -1624,22 +1770,21 @@ def delete_task(task_id, delete_files=True):
     Returns:
         success: 删除是否成功
     """
-    # 先获取任务信息，用于删除文件
-    task = get_task(task_id)
-    if not task:
-        logger.warning(f"任务 {task_id} 不存在，无法删除")
-        return False
-    
-    # 标记任务取消，尽快中断运行中的任务
-    request_task_cancel(task_id)
-
-    # 删除任务文件
-    if delete_files:
-        delete_task_files(task_id)
-    
-    # 删除任务记录
     conn = get_db_connection()
     try:
+        # 只确认任务存在，无需读取整行
+        if conn.execute('SELECT 1 FROM tasks WHERE id = ?', (task_id,)).fetchone() is None:
+            logger.warning(f"任务 {task_id} 不存在，无法删除")
+            return False
+
+        # 标记任务取消，尽快中断运行中的任务
+        request_task_cancel(task_id)
+
+        # 删除任务文件
+        if delete_files:
+            delete_task_files(task_id)
+
+        # 删除任务记录
         conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
         conn.commit()
         logger.info(f"任务 {task_id} 删除成功")
@@ -1661,18 +1806,21 @@ def clear_all_tasks(delete_files=True):
     Returns:
         success: 是否成功
     """
-    # 标记任务取消，尽快中断运行中的任务
-    tasks = get_all_tasks()
-    for task in tasks:
-        request_task_cancel(task['id'])
-
-    if delete_files:
-        for task in tasks:
-            delete_task_files(task['id'])
-    
-    # 清空任务表
     conn = get_db_connection()
     try:
+        # 只取任务ID，避免整表物化为 dict
+        task_ids = [row[0] for row in conn.execute('SELECT id FROM tasks')]
+
+        # 标记任务取消，尽快中断运行中的任务
+        for task_id in task_ids:
+            request_task_cancel(task_id)
+
+        # 文件删除不在事务内进行，避免长时间持有写锁
+        if delete_files:
+            for task_id in task_ids:
+                delete_task_files(task_id)
+
+        # 清空任务表
         conn.execute('DELETE FROM tasks')
         conn.commit()
         logger.info("所有任务已清空")
@@ -1784,13 +1932,15 @@ def delete_task_files(task_id):
         logger.error(f"验证任务 {task_id} 路径失败: {str(e)}")
         return False
 
-    if os.path.exists(task_dir_real):
-        try:
-            shutil.rmtree(task_dir_real)
-            logger.info(f"任务 {task_id} 的下载目录已删除: {task_dir_real}")
-        except Exception as e:
-            logger.error(f"删除任务 {task_id} 的下载目录失败: {str(e)}")
-            # 不直接返回False，尝试继续删除其他文件
+    # 直接删除并把“目录不存在”视为正常情况，省去额外的 exists 探测
+    try:
+        shutil.rmtree(task_dir_real)
+        logger.info(f"任务 {task_id} 的下载目录已删除: {task_dir_real}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"删除任务 {task_id} 的下载目录失败: {str(e)}")
+        # 不直接返回False，尝试继续删除其他文件
 
     # 封面图片现在保存在downloads目录中，无需单独删除
 
@@ -1837,7 +1987,8 @@ def reset_stuck_tasks(skip_active=False, cancel_active=False):
         
         if stuck_tasks:
             logger.warning(f"发现 {len(stuck_tasks)} 个可能卡住的任务，正在重置...")
-            reset_count = 0
+            reset_rows = []
+            now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             for task in stuck_tasks:
                 task_id = task[0]
@@ -1853,20 +2004,20 @@ def reset_stuck_tasks(skip_active=False, cancel_active=False):
                     continue
                 
                 # 重置为失败状态
-                conn.execute('''
-                    UPDATE tasks 
-                    SET status = ?, error_message = ?, updated_at = ?
-                    WHERE id = ?
-                ''', (TASK_STATES['FAILED'], 
-                      f"任务超时重置 (原状态: {old_status})",
-                      datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                      task_id))
-                reset_count += 1
+                reset_rows.append((TASK_STATES['FAILED'],
+                                   f"任务超时重置 (原状态: {old_status})",
+                                   now_str,
+                                   task_id))
                 
                 logger.info(f"重置任务 {task_id[:8]}... 从 {old_status} 到 failed")
             
+            conn.executemany('''
+                UPDATE tasks 
+                SET status = ?, error_message = ?, updated_at = ?
+                WHERE id = ?
+            ''', reset_rows)
             conn.commit()
-            return reset_count
+            return len(reset_rows)
         else:
             logger.info("没有发现卡住的任务")
             return 0
@@ -1897,14 +2048,14 @@ def validate_cookies(cookies_path, service_name="Unknown"):
             lines = [line for line in content.split('\n') if line.strip() and not line.startswith('#')]
             if not lines:
                 return False, "Netscape格式cookies文件没有有效的cookie条目"
-            logger.debug(f"{service_name} Netscape格式cookies, {len(lines)} 个条目")
+            logger.debug("%s Netscape格式cookies, %d 个条目", service_name, len(lines))
         elif content.startswith('[') or content.startswith('{'):
             # JSON格式
             import json
             cookies_data = json.loads(content)
             if not cookies_data:
                 return False, "JSON格式cookies文件为空数组"
-            logger.debug(f"{service_name} JSON格式cookies, {len(cookies_data)} 个条目")
+            logger.debug("%s JSON格式cookies, %d 个条目", service_name, len(cookies_data))
         else:
             logger.warning(f"{service_name} Cookies文件格式不明")
             return False, "Cookies文件格式不明"
@@ -2048,7 +2199,7 @@ class TaskProcessor:
                 args=[task_id],
             )
         except Exception as e:
-            logger.debug(f"为任务 {task_id} 注册延迟重试失败，将依赖定时扫描器: {e}")
+            logger.debug("为任务 %s 注册延迟重试失败，将依赖定时扫描器: %s", task_id, e)
 
     def _recover_stuck_tasks(self):
         """周期性清理非活动的卡住任务，并对活动卡住任务发送取消请求。"""
@@ -2321,19 +2472,17 @@ class TaskProcessor:
                     ok = self._recommend_partition(task_id, task_logger)
                     if ok:
                         completed_stages = _mark_stage_done(task_id, completed_stages, PIPELINE_STAGE_RECOMMEND_PARTITION)
-
-                task = get_task(task_id)
-                if task is None:
-                    task_logger.warning("任务对象为 None，跳过分区自动选择")
                 _raise_if_cancelled(task_id, task_logger)
 
             # 3. 内容审核（如启用）
+            moderation_ran = False
             if self.config.get('CONTENT_MODERATION_ENABLED', False):
                 if PIPELINE_STAGE_MODERATE_CONTENT in completed_stages:
                     task_logger.info("跳过内容审核（checkpoint已完成）")
                 else:
                     self._moderate_content(task_id, task_logger)
                     task = get_task(task_id)
+                    moderation_ran = True
                     if task is not None and task['status'] == TASK_STATES['AWAITING_REVIEW']:
                         # 审核不通过，进入人工审核；该阶段也视为已完成
                         completed_stages = _mark_stage_done(task_id, completed_stages, PIPELINE_STAGE_MODERATE_CONTENT)
@@ -2342,8 +2491,9 @@ class TaskProcessor:
                     completed_stages = _mark_stage_done(task_id, completed_stages, PIPELINE_STAGE_MODERATE_CONTENT)
                 _raise_if_cancelled(task_id, task_logger)
 
-            # 4. 审核通过后才下载视频文件
-            task = get_task(task_id)
+            # 4. 审核通过后才下载视频文件（审核阶段刚读取过任务时无需再查一次）
+            if not moderation_ran:
+                task = get_task(task_id)
             if task is None:
                 task_logger.error("任务对象为 None，无法下载视频文件")
                 return
@@ -2519,36 +2669,40 @@ class TaskProcessor:
         except Exception as e:
             logger.error(f"检查和启动下一个pending任务时出错: {str(e)}")
     
-    def _fetch_video_info(self, task_id, youtube_url, task_logger):
-        """只采集视频元数据和封面，不下载视频文件"""
-        from modules.youtube_handler import download_video_data
-        task_logger.info(f"采集视频信息: {youtube_url}")
-        update_task(task_id, status='fetching_info')
+    def _resolve_youtube_cookies_path(self, task_logger, action):
+        """解析并校验 YouTube cookies 文件，优先使用 config 目录下的同名文件；不可用时返回 None。
 
-        _raise_if_cancelled(task_id, task_logger)
-        
-        # 获取cookies文件路径，优先使用config目录下的文件
-        cookies_filename = os.path.basename(self.config.get('YOUTUBE_COOKIES_PATH', 'cookies.txt'))
-        # 首先尝试在config目录中查找
-        config_cookies_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', cookies_filename)
+        Cookie 文件可能被 CookieCloud 同步或网页上传随时更新，因此每次调用都重新检查，不做缓存。
+        """
+        configured_path = self.config.get('YOUTUBE_COOKIES_PATH', 'cookies.txt')
+        config_cookies_path = os.path.join(APP_ROOT_DIR, 'config', os.path.basename(configured_path))
         if os.path.exists(config_cookies_path):
             cookies_path = config_cookies_path
             task_logger.info(f"使用config目录中的cookies文件: {cookies_path}")
         else:
             # 如果config目录中不存在，则尝试使用配置中指定的路径
-            cookies_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), self.config.get('YOUTUBE_COOKIES_PATH', ''))
+            cookies_path = os.path.join(APP_ROOT_DIR, self.config.get('YOUTUBE_COOKIES_PATH', ''))
             if not os.path.exists(cookies_path):
                 task_logger.warning(f"指定的YouTube Cookies文件不存在: {cookies_path}")
-                cookies_path = None
+                return None
+
+        is_valid, error_msg = validate_cookies(cookies_path, "YouTube")
+        if not is_valid:
+            task_logger.error(f"YouTube Cookies验证失败: {error_msg}")
+            # 尝试不使用cookies继续
+            task_logger.info(f"尝试不使用cookies继续{action}...")
+            return None
+        return cookies_path
+
+    def _fetch_video_info(self, task_id, youtube_url, task_logger):
+        """只采集视频元数据和封面，不下载视频文件"""
+        from modules.youtube_handler import download_video_data
+        task_logger.info(f"采集视频信息: {youtube_url}")
+        update_task(task_id, status='fetching_info')
+
+        _raise_if_cancelled(task_id, task_logger)
         
-        # 验证cookies文件
-        if cookies_path:
-            is_valid, error_msg = validate_cookies(cookies_path, "YouTube")
-            if not is_valid:
-                task_logger.error(f"YouTube Cookies验证失败: {error_msg}")
-                # 尝试不使用cookies继续
-                task_logger.info("尝试不使用cookies继续采集信息...")
-                cookies_path = None
+        cookies_path = self._resolve_youtube_cookies_path(task_logger, "采集信息")
                 
         # 只采集信息
         try:
@@ -2575,10 +2729,9 @@ class TaskProcessor:
             video_description = ""
             if metadata_path and os.path.exists(metadata_path):
                 try:
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                        video_title = metadata.get('title', '')
-                        video_description = metadata.get('description', '')
+                    metadata = _load_task_metadata(metadata_path)
+                    video_title = metadata.get('title', '')
+                    video_description = metadata.get('description', '')
                 except Exception as e:
                     task_logger.error(f"读取视频元数据失败: {str(e)}")
             update_task(
@@ -2601,29 +2754,10 @@ class TaskProcessor:
 
         _raise_if_cancelled(task_id, task_logger)
         
-        # 获取cookies文件路径，优先使用config目录下的文件
-        cookies_filename = os.path.basename(self.config.get('YOUTUBE_COOKIES_PATH', 'cookies.txt'))
-        # 首先尝试在config目录中查找
-        config_cookies_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', cookies_filename)
-        if os.path.exists(config_cookies_path):
-            cookies_path = config_cookies_path
-            task_logger.info(f"使用config目录中的cookies文件: {cookies_path}")
-        else:
-            # 如果config目录中不存在，则尝试使用配置中指定的路径
-            cookies_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), self.config.get('YOUTUBE_COOKIES_PATH', ''))
-            if not os.path.exists(cookies_path):
-                task_logger.warning(f"指定的YouTube Cookies文件不存在: {cookies_path}")
-                cookies_path = None
-        
-        # 验证cookies文件
-        if cookies_path:
-            is_valid, error_msg = validate_cookies(cookies_path, "YouTube")
-            if not is_valid:
-                task_logger.error(f"YouTube Cookies验证失败: {error_msg}")
-                # 尝试不使用cookies继续
-                task_logger.info("尝试不使用cookies继续下载...")
-                cookies_path = None
+        cookies_path = self._resolve_youtube_cookies_path(task_logger, "下载")
                 
+        write_progress = _make_progress_writer(task_id)
+
         # 定义进度回调函数
         def progress_callback(progress_info):
             percent = progress_info.get('percent', 0)
@@ -2634,19 +2768,19 @@ class TaskProcessor:
             # 只显示百分比，简洁明了
             progress_msg = f"{percent:.1f}%"
             
-            # 详细信息记录到日志
-            detailed_msg = progress_msg
-            if file_size:
-                detailed_msg += f" / {file_size}"
-            if speed:
-                detailed_msg += f" @ {speed}"
-            if eta:
-                detailed_msg += f" ETA {eta}"
-            
             # 不再把每次下载进度记录为 INFO 到文件，以减少日志噪声；保留网页进度显示
-            task_logger.debug(f"下载进度: {detailed_msg}")
-            # 更新任务的上传进度字段用于显示（只显示百分比）
-            update_task(task_id, upload_progress=progress_msg, silent=True)
+            # 详细信息仅在 DEBUG 开启时才拼接
+            if task_logger.isEnabledFor(logging.DEBUG):
+                detailed_msg = progress_msg
+                if file_size:
+                    detailed_msg += f" / {file_size}"
+                if speed:
+                    detailed_msg += f" @ {speed}"
+                if eta:
+                    detailed_msg += f" ETA {eta}"
+                task_logger.debug("下载进度: %s", detailed_msg)
+            # 更新任务的上传进度字段用于显示（只显示百分比，按间隔节流写库）
+            write_progress(progress_msg, force=percent >= 100)
         
         # 只下载视频文件
         try:
@@ -2787,7 +2921,7 @@ class TaskProcessor:
                 youtube_url,
             ]
 
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            project_root = APP_ROOT_DIR
             configured_cookies_path = self.config.get('YOUTUBE_COOKIES_PATH', '')
             cookies_path = None
             if configured_cookies_path:
@@ -2811,7 +2945,7 @@ class TaskProcessor:
                 cmd, capture_output=True, text=True, timeout=120,
                 encoding='utf-8', errors='replace',
             )
-            task_logger.debug(f"yt-dlp 封面采集输出: {proc.stdout}")
+            task_logger.debug("yt-dlp 封面采集输出: %s", proc.stdout)
             if proc.returncode != 0:
                 task_logger.warning(f"yt-dlp 封面采集返回非零状态: {proc.returncode}, stderr: {proc.stderr}")
 
@@ -3017,12 +3151,11 @@ class TaskProcessor:
                                 # 显示ASR状态
                                 _t = get_task(task_id)
                                 prev_status = _t['status'] if _t else prev_status
-                                update_task(task_id, status=TASK_STATES['ASR_TRANSCRIBING'])
+                                update_task(task_id, status=TASK_STATES['ASR_TRANSCRIBING'], asr_warning_message=None)
                                 # 输出字幕路径（强制使用 SRT）
                                 asr_ext = '.srt'
                                 asr_subtitle_path = os.path.join(task_dir, f"asr_{task_id}{asr_ext}")
                                 out_path = None
-                                update_task(task_id, asr_warning_message=None)
                                 out_path = recognizer.transcribe_video_to_subtitles(video_path, asr_subtitle_path)
                                 # 恢复到字幕翻译状态
                                 update_task(task_id, status=prev_status)
@@ -3164,7 +3297,7 @@ class TaskProcessor:
                 if is_task_cancelled(task_id):
                     raise TaskCancelledError("任务已取消")
                 # 不再将每次字幕翻译进度记录为 INFO 到文件，减少日志噪声
-                task_logger.debug(f"字幕翻译进度: {progress:.1f}% ({current}/{total})")
+                task_logger.debug("字幕翻译进度: %.1f%% (%s/%s)", progress, current, total)
                 # 更新任务进度显示到网页
                 update_task(task_id, upload_progress=f"{progress:.1f}%", silent=True)
             
@@ -5866,8 +5999,8 @@ class TaskProcessor:
             
             task_logger.info("开始将字幕嵌入视频...")
             # 仅在调试时输出详细路径信息
-            task_logger.debug(f"视频路径: {video_path}")
-            task_logger.debug(f"字幕路径: {subtitle_path}")
+            task_logger.debug("视频路径: %s", video_path)
+            task_logger.debug("字幕路径: %s", subtitle_path)
             
             # 设置任务状态为转码视频中
             update_task(task_id, status=TASK_STATES['ENCODING_VIDEO'])
@@ -5997,7 +6130,7 @@ class TaskProcessor:
                         'SimHei'
                     ]
                     font_family = fallback_families[0]
-                    task_logger.debug(f"使用回退字体家族名称: {font_family}")
+                    task_logger.debug("使用回退字体家族名称: %s", font_family)
 
                 render_subtitle_ext = subtitle_ext
                 render_subtitle_name = f"sub{render_subtitle_ext}"
@@ -6133,7 +6266,7 @@ class TaskProcessor:
                             )
                         return available
                     except Exception as e:
-                        task_logger.debug(f"检测编码器 {encoder_name} 时出错: {e}")
+                        task_logger.debug("检测编码器 %s 时出错: %s", encoder_name, e)
                         _hw_encoder_cache[encoder_name] = False
                         _hw_encoder_error_cache[encoder_name] = self._short_error_text(str(e))
                         _hw_encoder_probe_meta_cache[encoder_name] = {
@@ -6324,7 +6457,7 @@ class TaskProcessor:
                             f"probe_error_short={nvenc_probe_error_short}"
                         )
                         if nvenc_probe_cmd_summary:
-                            task_logger.debug(f"NVENC HEVC探测命令摘要: {nvenc_probe_cmd_summary}")
+                            task_logger.debug("NVENC HEVC探测命令摘要: %s", nvenc_probe_cmd_summary)
 
                         if self._should_keep_nvidia_preference_on_probe_failure(
                             nvenc_listed=nvenc_listed,
@@ -6395,13 +6528,14 @@ class TaskProcessor:
                     output_video=simple_output,
                 )
                 
-                task_logger.debug(f"FFmpeg命令: {' '.join(cmd)}")
-                task_logger.debug(f"临时目录: {temp_dir}")
+                if task_logger.isEnabledFor(logging.DEBUG):
+                    task_logger.debug("FFmpeg命令: %s", ' '.join(cmd))
+                task_logger.debug("临时目录: %s", temp_dir)
                 
                 # 设置超时时间（根据视频时长估算）
                 timeout = self._estimate_embed_timeout(video_duration)
                 
-                task_logger.debug(f"设置处理超时时间: {timeout//60} 分钟")
+                task_logger.debug("设置处理超时时间: %d 分钟", timeout // 60)
                 
                 # 执行FFmpeg命令并实时获取进度
                 process = subprocess.Popen(
@@ -6455,6 +6589,7 @@ class TaskProcessor:
                 start_time = time.time()
                 last_progress_time = start_time
                 error_messages = []
+                write_progress = _make_progress_writer(task_id)
                 
                 while True:
                     if is_task_cancelled(task_id):
@@ -6496,8 +6631,8 @@ class TaskProcessor:
                                 
                                 if video_duration and current_time > last_time:
                                     progress = min((current_time / video_duration) * 100, 100)
-                                    # 更新任务进度显示
-                                    update_task(task_id, upload_progress=f"{progress:.1f}%", silent=True)
+                                    # 更新任务进度显示（按间隔节流写库）
+                                    write_progress(f"{progress:.1f}%", force=progress >= 100)
                                     last_time = current_time
                                     last_progress_time = time.time()
                             except (ValueError, IndexError):
@@ -6567,7 +6702,8 @@ class TaskProcessor:
                             aparams=aparams,
                             output_video=simple_output,
                         )
-                        task_logger.debug(f"回退FFmpeg命令: {' '.join(cmd_retry)}")
+                        if task_logger.isEnabledFor(logging.DEBUG):
+                            task_logger.debug("回退FFmpeg命令: %s", ' '.join(cmd_retry))
 
                         # 重新执行（缩短超时以避免长时间卡住）
                         process2 = subprocess.Popen(
@@ -6832,13 +6968,13 @@ class TaskProcessor:
             # 限制标签数量不超过6个
             if tags:
                 tags = tags[:6]
-                update_task(task_id, tags_generated=json.dumps(tags, ensure_ascii=False))
+                update_task(task_id, tags_generated=json_dumps_fast(tags))
             else:
                 task_logger.warning("标签生成失败")
-                update_task(task_id, tags_generated=json.dumps([], ensure_ascii=False))
+                update_task(task_id, tags_generated=json_dumps_fast([]))
         else:
             task_logger.warning("标签生成已禁用或缺少必要信息")
-            update_task(task_id, tags_generated=json.dumps([], ensure_ascii=False))
+            update_task(task_id, tags_generated=json_dumps_fast([]))
             
         task_logger.info(f"标签生成完成: {task.get('tags_generated', '[]')}")
         return True
@@ -6920,11 +7056,11 @@ class TaskProcessor:
             id_mapping_path = os.path.join(get_app_subdir('acfunid'), 'id_mapping.json')
             task_logger.info(f"尝试读取 AcFun 分区映射文件: {id_mapping_path}")
             try:
-                if not os.path.exists(id_mapping_path):
+                id_mapping_data = _load_acfun_id_mapping(id_mapping_path)
+                if id_mapping_data is None:
                     task_logger.error(f"分区映射文件不存在: {id_mapping_path}")
+                    id_mapping_data = []
                 else:
-                    with open(id_mapping_path, 'r', encoding='utf-8') as f:
-                        id_mapping_data = json.load(f)
                     task_logger.info(f"成功读取 AcFun 分区映射文件，包含 {len(id_mapping_data)} 个分类")
             except Exception as e:
                 task_logger.error(f"读取 AcFun 分区ID映射失败: {str(e)}")
@@ -7057,32 +7193,21 @@ class TaskProcessor:
         description = task.get('description_translated', '') or task.get('description_original', '')
         
         # 获取AI生成的标签
-        tags_string = ""
-        tags_list = [] # 初始化 tags_list
-        if task.get('tags_generated'):
-            try:
-                tags_list = json.loads(task.get('tags_generated', '[]'))
-                if tags_list:
-                    # 用于附加到描述的字符串可以保持原样，或者根据需要调整
-                    # tags_string = "，标签：" + "，".join(tags_list) 
-                    pass # 暂时不修改附加到描述的逻辑，主要确保tags_list被正确赋值
-            except json.JSONDecodeError:
-                task_logger.warning("解析AI生成标签失败，内容审核时将不包含标签。")
+        tags_list = _normalize_tags_list(task.get('tags_generated'))
+        if task.get('tags_generated') and not tags_list:
+            task_logger.warning("解析AI生成标签失败，内容审核时将不包含标签。")
 
         # 预处理内容，过滤掉URL等推广内容
-        url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+'
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        
-        filtered_title = re.sub(url_pattern, '', title)
-        filtered_title = re.sub(email_pattern, '', filtered_title)
+        filtered_title = _MODERATION_URL_RE.sub('', title)
+        filtered_title = _MODERATION_EMAIL_RE.sub('', filtered_title)
         
         # 将标签附加到描述文本后进行审核 (这部分可以保留，也可以考虑是否还需要)
         # description_with_tags = description + tags_string 
         # 为了更清晰，我们先只审核原始描述，标签单独审核
         from modules.utils import safe_str
-        filtered_description = re.sub(url_pattern, '', safe_str(description))
-        filtered_description = re.sub(email_pattern, '', filtered_description)
-        filtered_description = re.sub(r'\\n{3,}', '\\n\\n', filtered_description)
+        filtered_description = _MODERATION_URL_RE.sub('', safe_str(description))
+        filtered_description = _MODERATION_EMAIL_RE.sub('', filtered_description)
+        filtered_description = _EXCESS_BLANK_LINES_RE.sub('\n\n', filtered_description)
         
         task_logger.info("已过滤标题和描述中的URL和邮箱地址")
         task_logger.info(f"用于审核的描述文本: {filtered_description[:200]}...") # 日志记录部分内容
@@ -7129,31 +7254,29 @@ class TaskProcessor:
         
         task_logger.info(f"综合审核结果: overall_pass={moderation_result['overall_pass']}")
         if not moderation_result["overall_pass"]:
-            if not title_result.get("pass", True):
-                task_logger.warning("标题未通过审核")
-                for detail in title_result.get("details", []):
-                    task_logger.warning(f"标题问题: {detail.get('label')} - {detail.get('reason')}")
-                    
-            if not description_result.get("pass", True):
-                task_logger.warning("描述未通过审核")
-                for detail in description_result.get("details", []):
-                    task_logger.warning(f"描述问题: {detail.get('label')} - {detail.get('reason')}")
-            
-            if not tags_moderation_result.get("pass", True):
-                task_logger.warning("标签未通过审核")
-                for detail in tags_moderation_result.get("details", []):
-                    task_logger.warning(f"标签问题: {detail.get('label')} - {detail.get('reason')}")
-        
-        update_task(
-            task_id,
-            moderation_result=json.dumps(moderation_result, ensure_ascii=False)
-        )
+            # 每个未通过的类别合并为一条多行警告，避免按问题条数逐条写日志
+            for category, category_result in (
+                ("标题", title_result),
+                ("描述", description_result),
+                ("标签", tags_moderation_result),
+            ):
+                if category_result.get("pass", True):
+                    continue
+                lines = [f"{category}未通过审核"]
+                lines.extend(
+                    f"  {category}问题: {detail.get('label')} - {detail.get('reason')}"
+                    for detail in category_result.get("details", [])
+                )
+                task_logger.warning("\n".join(lines))
         
+        # 审核结果与（不通过时的）待审状态合并为一次写入
+        moderation_updates = {'moderation_result': json_dumps_fast(moderation_result)}
         if moderation_result["overall_pass"]:
             task_logger.info("内容审核通过")
         else:
             task_logger.info("内容审核不通过，需要人工审核")
-            update_task(task_id, status=TASK_STATES['AWAITING_REVIEW'])
+            moderation_updates['status'] = TASK_STATES['AWAITING_REVIEW']
+        update_task(task_id, **moderation_updates)
 
     def _get_embedded_video_candidate(self, video_path: str) -> str:
         if not video_path:
@@ -7369,9 +7492,10 @@ class TaskProcessor:
 
         return get_task(task_id)
     
-    def _upload_to_target(self, task_id, task_logger, allow_missing_translations=False):
-        """按任务平台分发上传实现。"""
-        task = get_task(task_id)
+    def _upload_to_target(self, task_id, task_logger, allow_missing_translations=False, task=None):
+        """按任务平台分发上传实现；调用方刚读取过任务时可直接传入 task。"""
+        if task is None:
+            task = get_task(task_id)
         if not task:
             task_logger.error("任务不存在")
             return
@@ -7460,7 +7584,7 @@ class TaskProcessor:
                 completed_stages = _mark_stage_done(task_id, completed_stages, PIPELINE_STAGE_GENERATE_TAGS)
             else:
                 task_logger.warning("强制上传前标签缺失，但缺少标题和简介，无法补生成标签")
-                update_task(task_id, tags_generated=json.dumps([], ensure_ascii=False), silent=True)
+                update_task(task_id, tags_generated=json_dumps_fast([]), silent=True)
                 task = get_task(task_id) or task
                 completed_stages = _mark_stage_done(task_id, completed_stages, PIPELINE_STAGE_GENERATE_TAGS)
 
@@ -7497,12 +7621,7 @@ class TaskProcessor:
         return get_task(task_id) or task
 
     def _upload_to_bilibili(self, task_id, task_logger, subtitle_prepared=False):
-        """上传到 Bilibili - 带并发控制"""
-        task = get_task(task_id)
-        if not task:
-            task_logger.error("任务不存在")
-            return
-
+        """上传到 Bilibili - 带并发控制（任务在获得上传锁后再读取）"""
         global upload_semaphore
         if upload_semaphore is None:
             task_logger.warning("upload_semaphore 为 None，正在初始化...")
@@ -7531,14 +7650,7 @@ class TaskProcessor:
             return
 
     def _upload_to_acfun(self, task_id, task_logger, subtitle_prepared=False):
-        """上传到AcFun - 带并发控制"""
-        from modules.acfun_uploader import AcfunUploader
-        
-        task = get_task(task_id)
-        if not task:
-            task_logger.error("任务不存在")
-            return
-        
+        """上传到AcFun - 带并发控制（任务在获得上传锁后再读取）"""
         # 使用信号量控制并发上传
         global upload_semaphore
         if upload_semaphore is None:
@@ -7643,11 +7755,10 @@ class TaskProcessor:
         
         if metadata_path and os.path.exists(metadata_path):
             try:
-                with open(metadata_path, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                    original_url = metadata.get('webpage_url', '')
-                    original_uploader = metadata.get('uploader', '')
-                    original_upload_date = metadata.get('upload_date', '')
+                metadata = _load_task_metadata(metadata_path)
+                original_url = metadata.get('webpage_url', '')
+                original_uploader = metadata.get('uploader', '')
+                original_upload_date = metadata.get('upload_date', '')
             except Exception as e:
                 task_logger.error(f"读取视频元数据失败: {str(e)}")
 
@@ -7669,7 +7780,7 @@ class TaskProcessor:
                 if len(tags) > 6:
                     tags = tags[:6]
                 try:
-                    update_task(task_id, tags_generated=json.dumps(tags, ensure_ascii=False))
+                    update_task(task_id, tags_generated=json_dumps_fast(tags))
                 except Exception:
                     pass
         
@@ -7762,7 +7873,7 @@ class TaskProcessor:
                 update_task(
                     task_id,
                     status=TASK_STATES['COMPLETED'],
-                    acfun_upload_response=json.dumps(result, ensure_ascii=False)
+                    acfun_upload_response=json_dumps_fast(result)
                 )
             else:
                 task_logger.error(f"视频上传失败: {result}")
@@ -7845,11 +7956,10 @@ class TaskProcessor:
 
         if metadata_path and os.path.exists(metadata_path):
             try:
-                with open(metadata_path, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                    original_url = metadata.get('webpage_url', original_url)
-                    original_uploader = metadata.get('uploader', '')
-                    original_upload_date = metadata.get('upload_date', '')
+                metadata = _load_task_metadata(metadata_path)
+                original_url = metadata.get('webpage_url', original_url)
+                original_uploader = metadata.get('uploader', '')
+                original_upload_date = metadata.get('upload_date', '')
             except Exception as e:
                 task_logger.error(f"读取视频元数据失败: {str(e)}")
 
@@ -7885,14 +7995,13 @@ class TaskProcessor:
                 if len(tags) > 12:
                     tags = tags[:12]
                 try:
-                    update_task(task_id, tags_generated=json.dumps(tags, ensure_ascii=False))
+                    update_task(task_id, tags_generated=json_dumps_fast(tags))
                 except Exception:
                     pass
 
         bilibili_cookies_path = self.config.get('BILIBILI_COOKIES_PATH', 'cookies/bili_cookies.json')
         if bilibili_cookies_path and not os.path.isabs(bilibili_cookies_path):
-            app_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            bilibili_cookies_path = os.path.join(app_root, bilibili_cookies_path)
+            bilibili_cookies_path = os.path.join(APP_ROOT_DIR, bilibili_cookies_path)
 
         # 固定 bilibili 分区优先；否则使用任务分区。并校验分区合法性
         task_partition_id = _get_task_partition_id(
@@ -8020,7 +8129,7 @@ class TaskProcessor:
                 update_task(
                     task_id,
                     status=TASK_STATES['COMPLETED'],
-                    bilibili_upload_response=json.dumps(result, ensure_ascii=False),
+                    bilibili_upload_response=json_dumps_fast(result),
                     upload_progress=None
                 )
             else:
@@ -8126,7 +8235,7 @@ def force_upload_task(task_id, config=None):
     
     try:
         # 直接执行上传步骤
-        processor._upload_to_target(task_id, task_logger, allow_missing_translations=True)
+        processor._upload_to_target(task_id, task_logger, allow_missing_translations=True, task=task)
 
         # 上传流程（强制路径）不会进入 process_task 的 finally，需手动唤醒队列
         try:
@@ -38,9 +38,129 @@ def get_app_subdir(subdir_name):
 import re
 import copy
 import json
+import atexit
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from types import SimpleNamespace
 from typing import Any, Optional
 from urllib.parse import urlparse
 
+try:  # orjson 为可选加速依赖，缺失时回退标准库 json
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def json_loads_fast(text):
+    """解析 JSON 文本：优先使用 orjson，失败或不可用时回退标准库 json。"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except Exception:
+            pass
+    return json.loads(text)
+
+
+def json_dumps_fast(value) -> str:
+    """序列化为保留非 ASCII 字符的 JSON 文本：优先使用 orjson。"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except Exception:
+            pass
+    return json.dumps(value, ensure_ascii=False)
+
+
+_LOG_MAX_OPEN_FILES = 64
+
+
+class _QueuedLogRouter(logging.Handler):
+    """在监听线程中按记录器名称把日志分发到对应的文件处理器
+
+    同一日志文件（如各模块共用的 task_{id}.log）只创建一个轮转处理器，避免多个处理器各自轮转同一文件。
+    长期运行会积累大量任务日志文件，这里只保持最近写入的少量文件处于打开状态，
+    其余文件句柄按 LRU 关闭，下次写入时由 FileHandler 以追加模式自动重新打开。
+    """
+
+    def __init__(self, max_open_files=_LOG_MAX_OPEN_FILES):
+        super().__init__()
+        self._handlers = {}
+        self._file_handlers = {}
+        self._open_handlers = OrderedDict()
+        self._max_open_files = max_open_files
+        self._register_lock = threading.Lock()
+
+    def register(self, logger_name, log_file, max_bytes, backup_count):
+        """为记录器登记目标文件；同一文件复用已有处理器。"""
+        path = os.path.normcase(os.path.abspath(log_file))
+        with self._register_lock:
+            handler = self._file_handlers.get(path)
+            if handler is None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                handler = RotatingFileHandler(
+                    log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+                )
+                # 记录在入队前已按各记录器自己的格式完成格式化
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                self._file_handlers[path] = handler
+            self._handlers[logger_name] = (path, handler)
+        return handler
+
+    def emit(self, record):
+        entry = self._handlers.get(record.name)
+        if entry is None:
+            return
+        path, handler = entry
+        handler.handle(record)
+        self._open_handlers[path] = handler
+        self._open_handlers.move_to_end(path)
+        while len(self._open_handlers) > self._max_open_files:
+            _, stale = self._open_handlers.popitem(last=False)
+            stale.acquire()
+            try:
+                if stale.stream is not None:
+                    stale.stream.close()
+                    stale.stream = None
+            finally:
+                stale.release()
+
+
+# 业务线程只把日志放入内存队列，由单个监听线程负责写盘（含轮转检查）
+_LOG_QUEUE = queue.SimpleQueue()
+_LOG_ROUTER = _QueuedLogRouter()
+_LOG_LISTENER = None
+_LOG_LISTENER_LOCK = threading.Lock()
+
+
+def _ensure_log_listener():
+    global _LOG_LISTENER
+    with _LOG_LISTENER_LOCK:
+        if _LOG_LISTENER is None:
+            _LOG_LISTENER = QueueListener(_LOG_QUEUE, _LOG_ROUTER)
+            _LOG_LISTENER.start()
+            # 进程退出时排空队列，避免丢失最后的日志
+            atexit.register(_LOG_LISTENER.stop)
+
+
+def attach_queued_file_handler(logger, log_file, formatter, max_bytes, backup_count, level=logging.INFO):
+    """为记录器添加经由共享监听线程写盘的轮转文件输出。
+
+    formatter 在调用线程中应用（QueueHandler 入队前格式化），因此共用同一文件的记录器可保留各自格式。
+    """
+    _LOG_ROUTER.register(logger.name, log_file, max_bytes, backup_count)
+    _ensure_log_listener()
+    queue_handler = QueueHandler(_LOG_QUEUE)
+    queue_handler.setFormatter(formatter)
+    queue_handler.setLevel(level)
+    logger.addHandler(queue_handler)
+    return queue_handler
+
 def process_cover(image_path, output_path=None, mode='crop'):
     """
     处理视频封面图片，使其适合AcFun上传要求（16:10比例）
@@ -212,17 +332,30 @@ def extract_json_from_text(text, expected_type=None):
     if not raw:
         return None
 
-    candidates = [raw]
-    for start_char, end_char in (('{', '}'), ('[', ']')):
-        block = _extract_balanced_json_block(raw, start_char, end_char)
-        if block and block not in candidates:
-            candidates.append(block)
+    try:
+        parsed = json_loads_fast(raw)
+    except Exception:
+        parsed = None
+    else:
+        if expected_type is None or isinstance(parsed, expected_type):
+            return parsed
 
-    for candidate in candidates:
-        try:
-            parsed = json.loads(candidate)
-        except Exception:
+    # 含前后缀文本时：从首个 { / [ 起用 C 解码器直接截取第一个完整 JSON 值，
+    # 失败再回退到逐字符的括号配对扫描
+    for start_char, end_char in (('{', '}'), ('[', ']')):
+        start = raw.find(start_char)
+        if start == -1:
             continue
+        try:
+            parsed, _ = _JSON_DECODER.raw_decode(raw, start)
+        except ValueError:
+            block = _extract_balanced_json_block(raw, start_char, end_char)
+            if not block:
+                continue
+            try:
+                parsed = json_loads_fast(block)
+            except Exception:
+                continue
         if expected_type is not None and not isinstance(parsed, expected_type):
             continue
         return parsed
@@ -264,6 +397,38 @@ def extract_chat_message_json(message, expected_type=dict):
     )
 
 
+def collect_chat_stream_message(response):
+    """汇总流式 chat.completions 响应为 message 对象；非流式响应直接返回其 message。"""
+    if hasattr(response, 'choices'):
+        choices = response.choices or []
+        return choices[0].message if choices else None
+
+    content_parts = []
+    reasoning_parts = []
+    received = False
+    for chunk in response:
+        choices = getattr(chunk, 'choices', None) or []
+        if not choices:
+            continue
+        received = True
+        delta = getattr(choices[0], 'delta', None)
+        if delta is None:
+            continue
+        content = getattr(delta, 'content', None)
+        if content:
+            content_parts.append(content)
+        reasoning = getattr(delta, 'reasoning_content', None)
+        if reasoning:
+            reasoning_parts.append(reasoning)
+
+    if not received:
+        return None
+    return SimpleNamespace(
+        content=''.join(content_parts),
+        reasoning_content=''.join(reasoning_parts),
+    )
+
+
 _THINKING_FALLBACK_WARNED_SCENES = set()
 _THINKING_FALLBACK_WARNED_SCENES_MAX = 128
 
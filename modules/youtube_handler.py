@@ -16,8 +16,7 @@ from modules.config_manager import (
     normalize_youtube_download_max_height,
     normalize_youtube_download_quality_mode,
 )
-from logging.handlers import RotatingFileHandler
-from .utils import get_app_subdir, get_app_root_dir
+from .utils import attach_queued_file_handler, get_app_subdir, get_app_root_dir
 from .ffmpeg_manager import get_ffmpeg_path, is_ffmpeg_usable
 from .cookiecloud import try_cookiecloud_youtube_sync
 from shutil import which as _which
@@ -451,12 +450,9 @@ def setup_task_logger(task_id):
     if not logger.handlers:  # 避免重复添加处理器
         logger.setLevel(logging.INFO)
         
-        # 文件处理器
-        file_handler = RotatingFileHandler(log_file, maxBytes=10485760, backupCount=5, encoding='utf-8')
+        # 文件处理器 - 与其他模块共用 task_{id}.log 的轮转处理器，由共享监听线程写入
         file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
+        attach_queued_file_handler(logger, log_file, file_formatter, max_bytes=10485760, backup_count=5)
         
         # 确保消息不会传播到根日志记录器
         logger.propagate = False
@@ -0,0 +1,599 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from modules.subtitle_translator import (
+    LLMRequester,
+    SubtitleItem,
+    SubtitleReader,
+    SubtitleTranslator,
+    SubtitleWriter,
+    TranslationConfig,
+    _TranslationCache,
+    _ITEM_JSON_OVERHEAD_TOKENS,
+    _MAX_OUTPUT_TOKENS,
+    _OUTPUT_EXPANSION,
+    _compute_retry_delay,
+    _estimate_tokens,
+)
+from modules.utils import collect_chat_stream_message
+
+
+class SubtitleReaderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, name, content, newline=None):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w', encoding='utf-8', newline=newline) as fh:
+            fh.write(content)
+        return path
+
+    def test_read_srt_parses_numbered_blocks_and_merges_lines(self):
+        path = self._write('a.srt', """1
+00:00:01,000 --> 00:00:02,500
+Hello
+world
+
+2
+0:00:03.000 --> 0:00:04,000
+Second line
+""")
+
+        items = SubtitleReader.read_srt(path)
+
+        self.assertEqual([item.index for item in items], [1, 2])
+        self.assertEqual(items[0].time_range, '00:00:01,000 --> 00:00:02,500')
+        self.assertEqual(items[0].source_text, 'Hello world')
+        self.assertEqual(items[1].start_time, '00:00:03,000')
+        self.assertEqual(items[1].source_text, 'Second line')
+
+    def test_read_srt_handles_crlf_bom_and_unnumbered_blocks(self):
+        path = self._write(
+            'b.srt',
+            '\ufeff00:00:01,000 --> 00:00:02,000\r\nFirst\r\n\r\n'
+            '00:00:02,000 --> 00:00:03,000\r\nSecond\r\n',
+            newline='',
+        )
+
+        items = SubtitleReader.read_srt(path)
+
+        self.assertEqual([(item.index, item.source_text) for item in items], [(1, 'First'), (2, 'Second')])
+
+    def test_read_srt_replaces_invalid_utf8_and_bare_cr(self):
+        path = os.path.join(self.tmpdir, 'bad.srt')
+        with open(path, 'wb') as fh:
+            fh.write(b'1\r00:00:01,000 --> 00:00:02,000\rCaf\xe9\r\r2\r00:00:02,000 --> 00:00:03,000\rOk\r')
+
+        items = SubtitleReader.read_srt(path)
+
+        self.assertEqual([item.source_text for item in items], ['Caf\ufffd', 'Ok'])
+
+    def test_read_srt_keeps_numeric_text_lines(self):
+        path = self._write('c.srt', """1
+00:00:01,000 --> 00:00:02,000
+Countdown
+42
+
+2
+00:00:02,000 --> 00:00:03,000
+Go
+""")
+
+        items = SubtitleReader.read_srt(path)
+
+        self.assertEqual([item.source_text for item in items], ['Countdown 42', 'Go'])
+
+    def test_read_vtt_skips_header_notes_identifiers_and_settings(self):
+        path = self._write('d.vtt', """WEBVTT
+Kind: captions
+Language: en
+
+NOTE This should be ignored
+even across lines
+
+caption-1
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+Line 1
+Line 2
+
+00:03.500 --> 00:04.000
+Short timestamp
+""")
+
+        items = SubtitleReader.read_vtt(path)
+
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items[0].time_range, '00:00:00,000 --> 00:00:02,000')
+        self.assertEqual(items[0].source_text, 'Line 1 Line 2')
+        self.assertEqual(items[1].index, 2)
+        self.assertEqual(items[1].start_time, '00:00:03,500')
+
+    def test_read_stops_after_max_items(self):
+        blocks = ''.join(
+            f"{i}\n00:00:0{i},000 --> 00:00:0{i},500\nLine {i}\n\n" for i in range(1, 6)
+        )
+        srt_path = self._write('e.srt', blocks)
+        vtt_path = self._write('e.vtt', 'WEBVTT\n\n' + blocks.replace(',', '.'))
+
+        self.assertEqual([item.index for item in SubtitleReader.read_srt(srt_path, max_items=2)], [1, 2])
+        self.assertEqual([item.index for item in SubtitleReader.read_vtt(vtt_path, max_items=2)], [1, 2])
+        self.assertEqual(len(SubtitleReader.read_srt(srt_path, max_items=10)), 5)
+
+    def test_read_missing_file_returns_empty_list(self):
+        self.assertEqual(SubtitleReader.read_srt(os.path.join(self.tmpdir, 'missing.srt')), [])
+        self.assertEqual(SubtitleReader.read_vtt(os.path.join(self.tmpdir, 'missing.vtt')), [])
+
+
+class SubtitleWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.items = [
+            SubtitleItem(1, '00:00:01,000', '00:00:02,000', 'Hello.', '你好。'),
+            SubtitleItem(2, '00:00:02,000', '00:00:03,000', 'Untranslated'),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _read(self, path):
+        with open(path, 'r', encoding='utf-8') as fh:
+            return fh.read()
+
+    def test_write_srt_outputs_translated_blocks(self):
+        path = os.path.join(self.tmpdir, 'out.srt')
+
+        SubtitleWriter.write_srt(self.items, path, translated=True)
+
+        self.assertEqual(
+            self._read(path),
+            "1\n00:00:01,000 --> 00:00:02,000\n你好\n\n"
+            "2\n00:00:02,000 --> 00:00:03,000\nUntranslated\n\n",
+        )
+        self.assertEqual(
+            [item.source_text for item in SubtitleReader.read_srt(path)],
+            ['你好', 'Untranslated'],
+        )
+
+    def test_strip_terminal_full_stop_keeps_ellipses_and_other_punctuation(self):
+        strip = SubtitleWriter._strip_terminal_full_stop
+
+        self.assertEqual(strip('你好。 \nOK. \n等等...\n真的？'), '你好\nOK\n等等...\n真的？')
+        self.assertEqual(strip('好。。'), '好。')
+
+    def test_write_vtt_outputs_header_and_dot_timestamps(self):
+        path = os.path.join(self.tmpdir, 'out.vtt')
+
+        SubtitleWriter.write_vtt(self.items, path, translated=False)
+
+        self.assertEqual(
+            self._read(path),
+            "WEBVTT\n\n"
+            "00:00:01.000 --> 00:00:02.000\nHello.\n\n"
+            "00:00:02.000 --> 00:00:03.000\nUntranslated\n\n",
+        )
+
+
+class SanitizeTranslatedTextTests(unittest.TestCase):
+    def setUp(self):
+        self.translator = object.__new__(SubtitleTranslator)
+
+    def test_strips_stacked_numbering_bullets_and_quotes(self):
+        sanitize = self.translator._sanitize_translated_text
+
+        self.assertEqual(sanitize('1. 2) - 你好'), '你好')
+        self.assertEqual(sanitize('(3) “测试”'), '测试')
+        self.assertEqual(sanitize('12点钟'), '12点钟')
+
+    def test_drops_duplicate_lines_and_terminal_full_stop(self):
+        sanitize = self.translator._sanitize_translated_text
+
+        self.assertEqual(sanitize('你好。\n你好。\n再见'), '你好\n再见')
+
+    def test_likely_untranslated_uses_chinese_to_latin_ratio(self):
+        check = self.translator._likely_untranslated
+
+        self.assertTrue(check('Hello', ''))
+        self.assertTrue(check('Hello', 'Hello'))
+        self.assertTrue(check('Hello world', 'Hello world 好'))
+        self.assertFalse(check('Hello', '你好 OK'))
+        self.assertFalse(check('...', '！？'))
+        self.assertFalse(check('你好', '你好'))
+
+
+class TranslationConfigTests(unittest.TestCase):
+    def test_numeric_fields_are_coerced_from_strings_and_blanks(self):
+        config = TranslationConfig(batch_size='5', max_batch_tokens='0', max_workers=None, timeout_seconds='')
+
+        self.assertEqual(config.batch_size, 5)
+        self.assertEqual(config.max_batch_tokens, 0)
+        self.assertEqual(config.max_workers, 2)
+        self.assertEqual(config.timeout_seconds, 600)
+
+    def test_fractional_values_keep_retry_delay_and_truncate_counts(self):
+        config = TranslationConfig(retry_delay='1.5', max_retries=2.0, batch_size='4.0', max_workers='abc')
+
+        self.assertEqual(config.retry_delay, 1.5)
+        self.assertEqual(config.max_retries, 2)
+        self.assertEqual(config.batch_size, 4)
+        self.assertEqual(config.max_workers, 2)
+
+
+class PackBatchesTests(unittest.TestCase):
+    def setUp(self):
+        self.translator = object.__new__(SubtitleTranslator)
+        self.translator.config = TranslationConfig(batch_size=3, max_batch_tokens=10)
+
+    def test_short_lines_are_packed_up_to_batch_size_within_budget(self):
+        self.translator.config.batch_size = 40
+        self.translator.config.max_batch_tokens = 3000
+
+        ranges = self.translator._pack_batches(['Hi there'] * 40)
+
+        self.assertEqual(ranges, [(0, 40)])
+
+    def test_batch_size_is_the_item_cap_with_token_budget(self):
+        self.translator.config.max_batch_tokens = 3000
+
+        ranges = self.translator._pack_batches(['a'] * 7)
+
+        self.assertEqual(ranges, [(0, 3), (3, 6), (6, 7)])
+
+    def test_long_lines_close_batch_early(self):
+        ranges = self.translator._pack_batches(['短句', '很长的一句字幕内容测试', '好', '行'])
+
+        self.assertEqual(ranges, [(0, 1), (1, 2), (2, 4)])
+
+    def test_long_lines_are_packed_against_the_output_limit(self):
+        self.translator.config.batch_size = 50
+        self.translator.config.max_batch_tokens = 3000
+        line = 'This is a fairly long subtitle line that keeps going for a while. ' * 2
+        tokens = _estimate_tokens(line)
+
+        ranges = self.translator._pack_batches([line] * 50)
+
+        self.assertGreater(len(ranges), 1)
+        for start, end in ranges:
+            self.assertLessEqual((end - start) * tokens, 3000)
+            self.assertLessEqual(
+                (end - start) * (int(tokens * _OUTPUT_EXPANSION) + _ITEM_JSON_OVERHEAD_TOKENS),
+                _MAX_OUTPUT_TOKENS,
+            )
+
+    def test_zero_budget_falls_back_to_item_count(self):
+        self.translator.config.max_batch_tokens = 0
+
+        ranges = self.translator._pack_batches(['很长的一句字幕内容测试'] * 4)
+
+        self.assertEqual(ranges, [(0, 3), (3, 4)])
+
+
+class TranslateConcurrentFatalErrorTests(unittest.TestCase):
+    def test_auth_error_stops_without_retrying_other_batches(self):
+        class AuthError(Exception):
+            status_code = 401
+
+        translator = object.__new__(SubtitleTranslator)
+        translator.config = TranslationConfig(batch_size=1, max_workers=1, max_retries=3, retry_delay=0)
+        translator.task_id = 't'
+        translator.logger = MagicMock()
+        translator.llm_requester = MagicMock()
+        translator.llm_requester.translate_batch.side_effect = AuthError('invalid key')
+        items = [SubtitleItem(i, '00:00:00,000', '00:00:01,000', f'Line {i}') for i in range(1, 6)]
+
+        self.assertFalse(translator._translate_concurrent(items, 'unused.srt'))
+        self.assertEqual(translator.llm_requester.translate_batch.call_count, 1)
+
+
+class TranslateConcurrentCacheTests(unittest.TestCase):
+    def test_echoed_repeated_line_is_not_replayed_from_cache(self):
+        requester = object.__new__(LLMRequester)
+        requester.client = object()
+        requester.logger = MagicMock()
+        requester._translation_cache = {}
+        requester._persistent_cache = None
+        requester.openai_config = {}
+        # 模型把 "Thank you." 原样回显，其余行正常翻译
+        requester._request_batch = MagicMock(
+            side_effect=lambda texts, target_language, batch_id='': [
+                text if text == 'Thank you.' else f'译文{text}' for text in texts
+            ]
+        )
+        translator = object.__new__(SubtitleTranslator)
+        translator.config = TranslationConfig(batch_size=1, max_batch_tokens=0, max_workers=1, max_retries=1)
+        translator.task_id = 't'
+        translator.logger = MagicMock()
+        translator.llm_requester = requester
+        translator._repair_untranslated_items = MagicMock()
+        translator._finalize_residual_untranslated_items = MagicMock(return_value=True)
+        translator._write_translated_file = MagicMock(return_value=True)
+        items = [
+            SubtitleItem(i, '00:00:00,000', '00:00:01,000', text)
+            for i, text in enumerate(['Thank you.', 'Hello', 'Thank you.', 'Hello'], 1)
+        ]
+
+        self.assertTrue(translator._translate_concurrent(items, 'unused.srt'))
+
+        requested = [call.args[0] for call in requester._request_batch.call_args_list]
+        self.assertEqual(requested, [['Thank you.'], ['Hello'], ['Thank you.']])
+        self.assertEqual(requester._translation_cache, {('zh', 'Hello'): '译文Hello'})
+        self.assertEqual(items[3].translated_text, '译文Hello')
+
+
+class RepairUntranslatedItemsTests(unittest.TestCase):
+    def test_strict_mode_only_retries_lines_left_untranslated(self):
+        translator = object.__new__(SubtitleTranslator)
+        translator.config = TranslationConfig(batch_size=2, max_batch_tokens=0, max_workers=2)
+        translator.task_id = 't'
+        translator.logger = MagicMock()
+        translator.llm_requester = MagicMock()
+        translator.llm_requester.translate_batch.side_effect = (
+            lambda texts, target_language, batch_id='', use_cache=True: [
+                text if text == 'Stubborn' else f'译文{text}' for text in texts
+            ]
+        )
+        translator.llm_requester.translate_batch_strict.return_value = ['顽固']
+        items = [
+            SubtitleItem(i, '00:00:00,000', '00:00:01,000', text)
+            for i, text in enumerate(['One', 'Stubborn', 'Three'], 1)
+        ]
+
+        translator._repair_untranslated_items(items)
+
+        self.assertEqual([item.translated_text for item in items], ['译文One', '顽固', '译文Three'])
+        self.assertEqual(translator.llm_requester.translate_batch.call_count, 2)
+        translator.llm_requester.translate_batch_strict.assert_called_once()
+        self.assertEqual(translator.llm_requester.translate_batch_strict.call_args.args[0], ['Stubborn'])
+
+    def test_duplicate_lines_in_a_batch_are_requested_once(self):
+        translator = object.__new__(SubtitleTranslator)
+        translator.config = TranslationConfig(batch_size=4, max_workers=1)
+        translator.task_id = 't'
+        translator.logger = MagicMock()
+        translator.llm_requester = MagicMock()
+        translator.llm_requester.translate_batch.side_effect = (
+            lambda texts, target_language, batch_id='', use_cache=True: [f'译文{text}' for text in texts]
+        )
+        items = [
+            SubtitleItem(i, '00:00:00,000', '00:00:01,000', text)
+            for i, text in enumerate(['Music', 'Hi', 'Music', 'Music'], 1)
+        ]
+
+        translator._repair_untranslated_items(items)
+
+        self.assertEqual(translator.llm_requester.translate_batch.call_args.args[0], ['Music', 'Hi'])
+        self.assertEqual([item.translated_text for item in items], ['译文Music', '译文Hi', '译文Music', '译文Music'])
+
+
+    def test_auto_worker_count_matches_the_main_pass(self):
+        translator = object.__new__(SubtitleTranslator)
+        translator.config = TranslationConfig(batch_size=1, max_batch_tokens=0, max_workers=0)
+        translator.task_id = 't'
+        translator.logger = MagicMock()
+        translator.llm_requester = MagicMock()
+        translator.llm_requester.translate_batch.side_effect = (
+            lambda texts, target_language, batch_id='', use_cache=True: [f'译文{text}' for text in texts]
+        )
+        items = [SubtitleItem(i, '00:00:00,000', '00:00:01,000', f'Line {i}') for i in range(1, 6)]
+
+        with patch('modules.subtitle_translator._cached_memory_percent', return_value=None), \
+                patch('modules.subtitle_translator.concurrent.futures.ThreadPoolExecutor',
+                      wraps=ThreadPoolExecutor) as pool:
+            translator._repair_untranslated_items(items)
+
+        self.assertEqual(pool.call_args.kwargs['max_workers'], 5)
+        self.assertEqual(translator._resolve_max_workers(5), 5)
+        with patch('modules.subtitle_translator._cached_memory_percent', return_value=90.0):
+            self.assertEqual(translator._resolve_max_workers(5), 2)
+
+
+class QuickRepairTranslatedFileTests(unittest.TestCase):
+    def test_short_untranslated_lines_go_out_in_one_strict_request(self):
+        translator = object.__new__(SubtitleTranslator)
+        translator.config = TranslationConfig(batch_size=3)
+        translator.task_id = 't'
+        translator.logger = MagicMock()
+        translator.writer = MagicMock()
+        translator.reader = MagicMock()
+        translator.reader.read_srt.return_value = [
+            SubtitleItem(i, '00:00:00,000', '00:00:01,000', f'Line {i}') for i in range(1, 21)
+        ]
+        translator.llm_requester = MagicMock()
+        translator.llm_requester.translate_batch_strict.side_effect = (
+            lambda texts, target_language, batch_id='': [f'第{n}行' for n in range(len(texts))]
+        )
+
+        self.assertTrue(translator.quick_repair_translated_file('input.srt', 'output.srt'))
+
+        translator.llm_requester.translate_batch_strict.assert_called_once()
+        self.assertEqual(len(translator.llm_requester.translate_batch_strict.call_args.args[0]), 20)
+
+
+class ComputeRetryDelayTests(unittest.TestCase):
+    def test_backs_off_exponentially_with_jitter(self):
+        with patch('modules.subtitle_translator.random.uniform', return_value=0.5) as uniform:
+            self.assertEqual(_compute_retry_delay(2, 0), 2.5)
+            self.assertEqual(_compute_retry_delay(2, 2), 8.5)
+            uniform.assert_called_with(0, 1.0)
+
+    def test_honors_retry_after_header(self):
+        exc = Exception('rate limited')
+        exc.response = SimpleNamespace(headers={'retry-after': '30'})
+
+        with patch('modules.subtitle_translator.random.uniform', return_value=0):
+            self.assertEqual(_compute_retry_delay(2, 0, exc), 30.0)
+
+
+class LLMRequesterCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.requester = object.__new__(LLMRequester)
+        self.requester.client = object()
+        self.requester.logger = MagicMock()
+        self.requester._translation_cache = {}
+        self.requester._persistent_cache = None
+        self.requester._system_prompt_cache = {}
+        self.requester.openai_config = {'OPENAI_MODEL_NAME': 'test-model'}
+        self.requester._request_batch = MagicMock(
+            side_effect=lambda texts, target_language, batch_id='': [f'译:{text}' for text in texts]
+        )
+
+    def test_repeated_lines_are_served_from_cache(self):
+        first = self.requester.translate_batch(['Hello', 'World'], 'zh', batch_id='b1')
+        self.requester.remember_translations(list(zip(['Hello', 'World'], first)), 'zh')
+        second = self.requester.translate_batch([' Hello ', 'Again'], 'zh', batch_id='b2')
+
+        self.assertEqual(first, ['译:Hello', '译:World'])
+        self.assertEqual(second, ['译:Hello', '译:Again'])
+        self.assertEqual(self.requester._request_batch.call_args_list[1].args[0], ['Again'])
+
+    def test_cache_keeps_case_distinct_lines_apart(self):
+        self.requester.remember_translations([('US', '美国')], 'zh')
+
+        result = self.requester.translate_batch(['US', 'us'], 'zh')
+
+        self.assertEqual(result, ['美国', '译:us'])
+
+    def test_model_output_is_not_cached_until_remembered(self):
+        self.requester.translate_batch(['Hello'], 'zh')
+        self.requester.translate_batch(['Hello'], 'zh')
+
+        self.assertEqual(self.requester._translation_cache, {})
+        self.assertEqual(self.requester._request_batch.call_count, 2)
+
+    def test_use_cache_false_always_requests(self):
+        self.requester.translate_batch(['Hello'], 'zh')
+        self.requester.translate_batch(['Hello'], 'zh', use_cache=False)
+
+        self.assertEqual(self.requester._request_batch.call_count, 2)
+
+    def test_chinese_lines_pass_through_when_source_and_target_share_a_script(self):
+        self.requester.openai_config['SOURCE_LANGUAGE'] = 'zh-CN'
+        result = self.requester.translate_batch(['你好', 'Hello', '日本語です'], 'zh-CN')
+
+        self.assertEqual(result, ['你好', '译:Hello', '译:日本語です'])
+        self.assertEqual(self.requester._request_batch.call_args.args[0], ['Hello', '日本語です'])
+
+        self.requester._request_batch.reset_mock()
+        self.assertEqual(self.requester.translate_batch(['你好'], 'zh_cn', use_cache=False), ['你好'])
+        self.requester._request_batch.assert_not_called()
+        self.assertEqual(self.requester.translate_batch(['你好'], 'en'), ['译:你好'])
+
+    def test_han_only_lines_are_translated_when_script_is_not_known_to_match(self):
+        for source, target in (('auto', 'zh'), ('zh', 'zh'), ('zh-TW', 'zh-CN'), ('zh-CN', 'zh-HK'), ('ja', 'zh-CN')):
+            self.requester._request_batch.reset_mock()
+            self.requester.openai_config['SOURCE_LANGUAGE'] = source
+
+            result = self.requester.translate_batch(['東京大学', '這是繁體'], target, use_cache=False)
+
+            self.assertEqual(result, ['译:東京大学', '译:這是繁體'], (source, target))
+            self.requester._request_batch.assert_called_once()
+
+    def test_parses_json_wrapped_in_reasoning_and_prose(self):
+        message = SimpleNamespace(
+            content='<think>plan {draft}</think>Here you go: {"translations": ["你好", "世界"]} Hope it helps!'
+        )
+
+        result = self.requester._parse_structured_translation_result(message, 3, 'b1')
+
+        self.assertEqual(result, ['你好', '世界', ''])
+
+    def test_user_prompt_is_valid_json_with_texts(self):
+        prompt = self.requester._build_structured_user_prompt(['Hello "x"', '你好'])
+
+        self.assertEqual(
+            json.loads(prompt),
+            {
+                'task': 'subtitle_translation',
+                'requirements': {
+                    'one_to_one_alignment': True,
+                    'no_cross_item_carryover': True,
+                    'keep_fragment_boundaries': True,
+                },
+                'texts': ['Hello "x"', '你好'],
+            },
+        )
+
+    def _use_persistent_cache(self, **kwargs):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        cache = _TranslationCache(os.path.join(tmpdir, 'cache.db'), **kwargs)
+        self.addCleanup(lambda: cache._conn and cache._conn.close())
+        self.requester._persistent_cache = cache
+        return cache
+
+    def test_persistent_cache_round_trip_skips_request(self):
+        self._use_persistent_cache()
+
+        self.requester.store_persistent_translations([('Hello', '你好')], 'zh')
+        result = self.requester.translate_batch([' Hello ', 'World'], 'zh')
+
+        self.assertEqual(result, ['你好', '译:World'])
+        self.assertEqual(self.requester._request_batch.call_args.args[0], ['World'])
+
+    def test_persistent_cache_misses_after_prompt_or_model_change(self):
+        self._use_persistent_cache()
+        self.requester.store_persistent_translations([('Hello', '你好')], 'zh')
+
+        self.requester._system_prompt_cache = {'zh': 'edited prompt'}
+        self.requester.openai_config['PROMPT_MODE'] = 'custom'
+        self.requester.translate_batch(['Hello'], 'zh')
+        self.requester.openai_config = {'OPENAI_MODEL_NAME': 'other-model'}
+        self.requester._system_prompt_cache = {}
+        self.requester.translate_batch(['Hello'], 'zh')
+
+        self.assertEqual(self.requester._request_batch.call_count, 2)
+
+    def test_persistent_cache_evicts_oldest_rows_over_cap(self):
+        cache = self._use_persistent_cache(max_rows=2)
+
+        for n in range(3):
+            with patch('modules.subtitle_translator.time.time', return_value=1000.0 + n):
+                cache.put_many([(bytes([n]), f'译{n}')])
+
+        self.assertEqual(cache.get_many([b'\x00', b'\x01', b'\x02']), {b'\x01': '译1', b'\x02': '译2'})
+
+    def test_persistent_cache_prunes_expired_rows_on_connect(self):
+        cache = self._use_persistent_cache()
+        with patch('modules.subtitle_translator.time.time', return_value=1.0):
+            cache.put_many([(b'old', '旧')])
+        cache._conn.close()
+
+        reopened = _TranslationCache(cache._db_path, max_age_seconds=60)
+        self.addCleanup(lambda: reopened._conn and reopened._conn.close())
+
+        self.assertEqual(reopened.get_many([b'old']), {})
+
+
+class CollectChatStreamMessageTests(unittest.TestCase):
+    def _chunk(self, content=None):
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+    def test_joins_streamed_deltas(self):
+        stream = iter([
+            self._chunk('{"translations": '),
+            SimpleNamespace(choices=[]),
+            self._chunk(None),
+            self._chunk('["你好"]}'),
+        ])
+
+        message = collect_chat_stream_message(stream)
+
+        self.assertEqual(message.content, '{"translations": ["你好"]}')
+
+    def test_passes_through_non_stream_response_and_empty_stream(self):
+        message = SimpleNamespace(content='{}')
+
+        self.assertIs(collect_chat_stream_message(SimpleNamespace(choices=[SimpleNamespace(message=message)])), message)
+        self.assertIsNone(collect_chat_stream_message(iter([])))
+
+
+if __name__ == '__main__':
+    unittest.main()
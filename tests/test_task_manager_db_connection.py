@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from modules import task_manager as tm
+
+
+class DbConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        patcher = patch.object(tm, 'DB_PATH', os.path.join(self.tmpdir, 'tasks.db'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(tm._close_db_connections)
+
+    def test_reuses_connection_per_thread_and_rolls_back_on_close(self):
+        conn = tm.get_db_connection()
+        conn.execute('CREATE TABLE t (v INTEGER)')
+        conn.execute('INSERT INTO t VALUES (1)')
+        conn.close()
+
+        again = tm.get_db_connection()
+        self.assertIs(again, conn)
+        self.assertEqual(again.execute('SELECT COUNT(*) FROM t').fetchone()[0], 0)
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(tm.get_db_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn)
+
+    def test_reopens_when_db_path_changes(self):
+        conn = tm.get_db_connection()
+
+        with patch.object(tm, 'DB_PATH', os.path.join(self.tmpdir, 'other.db')):
+            self.assertIsNot(tm.get_db_connection(), conn)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -80,6 +80,10 @@ class DeleteTaskFilesTests(unittest.TestCase):
         self.assertTrue(result)
         self.assertFalse(os.path.exists(task_dir))
 
+    def test_delete_task_files_treats_missing_directory_as_success(self):
+        self.assertTrue(self.delete_task_files(self.TASK_ID))
+        self.mock_logger.error.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,40 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from modules import task_manager as tm
+
+
+class AcfunIdMappingCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.path = os.path.join(self.tmpdir, 'id_mapping.json')
+        patcher = patch.object(tm, '_ACFUN_ID_MAPPING_CACHE', (None, None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write(self, data, mtime):
+        with open(self.path, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_reuses_parsed_data_until_file_changes(self):
+        self._write([{'name': 'A'}], 1000)
+
+        first = tm._load_acfun_id_mapping(self.path)
+        with patch.object(tm.json, 'load', side_effect=AssertionError('should be cached')):
+            self.assertIs(tm._load_acfun_id_mapping(self.path), first)
+
+        self._write([{'name': 'A'}, {'name': 'B'}], 2000)
+        self.assertEqual(len(tm._load_acfun_id_mapping(self.path)), 2)
+
+    def test_missing_file_returns_none(self):
+        self.assertIsNone(tm._load_acfun_id_mapping(os.path.join(self.tmpdir, 'missing.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from modules import task_manager as tm
+
+
+class TaskMetadataCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.addCleanup(tm._read_task_metadata_fields.cache_clear)
+        self.path = os.path.join(self.tmpdir, 'metadata.json')
+
+    def _write(self, data, mtime):
+        with open(self.path, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, ensure_ascii=False)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_keeps_only_upload_fields_and_reuses_until_file_changes(self):
+        self._write({'title': '标题', 'uploader': 'someone', 'formats': [{'id': 1}]}, 1000)
+
+        first = tm._load_task_metadata(self.path)
+        self.assertEqual(first, {'title': '标题', 'uploader': 'someone'})
+        with patch.object(tm, 'json_loads_fast', side_effect=AssertionError('should be cached')):
+            self.assertIs(tm._load_task_metadata(self.path), first)
+
+        self._write({'title': '新标题'}, 2000)
+        self.assertEqual(tm._load_task_metadata(self.path), {'title': '新标题'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from unittest.mock import patch
+
+from modules import task_manager as tm
+
+
+class ProgressWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = [100.0]
+        self.writes = []
+        patchers = [
+            patch.object(tm.time, 'monotonic', side_effect=lambda: self.clock[0]),
+            patch.object(tm, 'update_task', side_effect=lambda task_id, **kwargs: self.writes.append(kwargs['upload_progress'])),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_throttles_changes_within_interval_and_skips_repeats(self):
+        write = tm._make_progress_writer('task-1', min_interval=1.0)
+
+        write('1.0%')
+        write('1.0%')
+        self.clock[0] += 0.5
+        write('2.0%')
+        self.clock[0] += 0.6
+        write('3.0%')
+
+        self.assertEqual(self.writes, ['1.0%', '3.0%'])
+
+    def test_force_bypasses_interval(self):
+        write = tm._make_progress_writer('task-1', min_interval=1.0)
+
+        write('99.0%')
+        write('100.0%', force=True)
+
+        self.assertEqual(self.writes, ['99.0%', '100.0%'])
+
+
+if __name__ == '__main__':
+    unittest.main()
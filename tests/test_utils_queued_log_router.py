@@ -0,0 +1,63 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from modules import utils
+
+
+class QueuedLogRouterTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.router = utils._QueuedLogRouter(max_open_files=2)
+        self.handlers = {}
+        for name in ('task_a', 'task_b', 'task_c'):
+            handler = self.router.register(name, self._path(name), max_bytes=0, backup_count=0)
+            self.addCleanup(handler.close)
+            self.handlers[name] = handler
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir, f'{name}.log')
+
+    def _emit(self, name, msg):
+        self.router.handle(logging.LogRecord(name, logging.INFO, __file__, 0, msg, None, None))
+
+    def _read(self, name):
+        with open(self._path(name), encoding='utf-8') as fh:
+            return fh.read()
+
+    def test_closes_least_recently_used_files_and_reopens_on_write(self):
+        self._emit('task_a', 'a1')
+        self._emit('task_b', 'b1')
+        self._emit('task_c', 'c1')
+
+        self.assertIsNone(self.handlers['task_a'].stream)
+        self.assertIsNotNone(self.handlers['task_c'].stream)
+
+        self._emit('task_a', 'a2')
+        self.handlers['task_a'].flush()
+
+        self.assertEqual(self._read('task_a'), 'a1\na2\n')
+        self.assertIsNone(self.handlers['task_b'].stream)
+
+    def test_loggers_writing_the_same_file_share_one_handler(self):
+        shared = self.router.register('subtitle_task_a', self._path('task_a'), max_bytes=0, backup_count=0)
+
+        self.assertIs(shared, self.handlers['task_a'])
+
+        self._emit('task_a', 'from task manager')
+        self._emit('subtitle_task_a', 'from subtitle translator')
+        shared.flush()
+
+        self.assertEqual(self._read('task_a'), 'from task manager\nfrom subtitle translator\n')
+
+    def test_ignores_unregistered_loggers(self):
+        self._emit('task_unknown', 'x')
+
+        self.assertEqual(len(self.router._open_handlers), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()